@@ -1,5 +1,6 @@
 import logging
 import time
+import uuid
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from fastapi.responses import JSONResponse
@@ -212,6 +213,8 @@ async def search_chats(
     message_count_max: Optional[int] = Query(None, description="Maximum message count"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor_updated_at: Optional[datetime] = Query(None, description="Keyset cursor from a previous page's next_cursor"),
+    cursor_id: Optional[uuid.UUID] = Query(None, description="Keyset cursor from a previous page's next_cursor"),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -237,7 +240,8 @@ async def search_chats(
             "message_count_min": message_count_min,
             "message_count_max": message_count_max,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "cursor": (cursor_updated_at, cursor_id) if cursor_updated_at is not None and cursor_id is not None else None
         }
         
         # Remove None values
@@ -257,7 +261,8 @@ async def search_chats(
             total_count=result["data"]["total_count"],
             page=result["data"]["page"],
             page_size=result["data"]["page_size"],
-            total_pages=result["data"]["total_pages"]
+            total_pages=result["data"]["total_pages"],
+            next_cursor=result["data"]["next_cursor"]
         )
     except Exception as e:
         duration = time.time() - start_time
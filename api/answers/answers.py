@@ -1,11 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 from typing import List
 import uuid
 
-from services.database import get_db
-from services.repositories import get_answer_repository
-from services.repositories import get_question_repository
+from services.repositories import QuestionRepository, get_question_repository
+from services.repositories import AnswerRepository, get_answer_repository
 from models.schemas.request_models import AnswerCreateRequest
 from models.schemas.response_models import AnswerResponse, GeneralResponse
 from services.dependencies import get_current_user
@@ -18,12 +16,12 @@ router = APIRouter(prefix="/answers", tags=["Answers"])
 def create_answer(
     answer_data: AnswerCreateRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    question_repo: QuestionRepository = Depends(get_question_repository),
+    answer_repo: AnswerRepository = Depends(get_answer_repository)
 ):
     """إنشاء إجابة جديدة"""
     try:
         # التحقق من وجود السؤال
-        question_repo = get_question_repository()
         question = question_repo.get_question_by_id(uuid.UUID(answer_data.question_id))
         if not question:
             raise HTTPException(
@@ -31,7 +29,6 @@ def create_answer(
                 detail="Question not found"
             )
         
-        answer_repo = get_answer_repository()
         answer = answer_repo.create_answer(
             answer=answer_data.answer,
             question_id=uuid.UUID(answer_data.question_id),
@@ -57,10 +54,9 @@ def create_answer(
 
 
 @router.get("/question/{question_id}", response_model=List[AnswerResponse])
-def get_answers_by_question(question_id: str, db: Session = Depends(get_db)):
+def get_answers_by_question(question_id: str, answer_repo: AnswerRepository = Depends(get_answer_repository)):
     """الحصول على جميع إجابات سؤال معين"""
     try:
-        answer_repo = get_answer_repository()
         answers = answer_repo.get_answers_by_question_id(uuid.UUID(question_id))
         
         return [
@@ -82,10 +78,9 @@ def get_answers_by_question(question_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{answer_id}", response_model=AnswerResponse)
-def get_answer_by_id(answer_id: str, db: Session = Depends(get_db)):
+def get_answer_by_id(answer_id: str, answer_repo: AnswerRepository = Depends(get_answer_repository)):
     """الحصول على إجابة بواسطة المعرف"""
     try:
-        answer_repo = get_answer_repository()
         answer = answer_repo.get_answer_by_id(uuid.UUID(answer_id))
         
         if not answer:
@@ -112,10 +107,9 @@ def get_answer_by_id(answer_id: str, db: Session = Depends(get_db)):
 
 
 @router.delete("/{answer_id}", response_model=GeneralResponse)
-def delete_answer(answer_id: str, db: Session = Depends(get_db)):
+def delete_answer(answer_id: str, answer_repo: AnswerRepository = Depends(get_answer_repository)):
     """حذف إجابة"""
     try:
-        answer_repo = get_answer_repository()
         success = answer_repo.delete_answer(uuid.UUID(answer_id))
         
         if not success:
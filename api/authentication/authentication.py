@@ -13,6 +13,7 @@ from services.repositories import get_user_repository
 from services.auth import get_auth_service
 from config.config_loader import config_loader
 from services.auth import get_two_factor_auth_service
+from services.auth.user_management_service import get_user_management_service
 from services.database.database import get_db
 from config.logging_config import (
     get_logger,
@@ -100,6 +101,7 @@ class AuthenticationService:
                         detail=self.config_loader.get_message("errors", "oauth_account_creation_failed")
                     )
                 logger.debug(f"OAuth user created successfully: {user.email}")
+                get_user_management_service().invalidate_user_stats()
             else:
                 logger.debug(f"OAuth user found: {user.email}")
             
@@ -207,7 +209,12 @@ class AuthenticationService:
 
             # 3. تحديث تاريخ آخر تسجيل دخول وإنشاء Token (نفس الكود السابق)
             logger.debug("Updating user last login time")
-            self.user_repository.update_user(db, str(user.id), {"last_login_at": datetime.now(timezone.utc)})
+            login_update = {"last_login_at": datetime.now(timezone.utc)}
+            if self.auth_service.password_needs_rehash(user.password_hash):
+                # Transparently upgrade legacy bcrypt hashes now that we have the plaintext
+                logger.debug("Rehashing password with current scheme")
+                login_update["password_hash"] = self.auth_service.hash_password(login_data.password)
+            self.user_repository.update_user(db, str(user.id), login_update)
             
             if login_data.remember_me:
                 expires_delta = timedelta(days=30)
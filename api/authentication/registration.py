@@ -28,6 +28,7 @@ from services.auth import get_auth_service
 from services.repositories import get_user_repository
 from services.email import get_email_service
 from services.auth import get_oauth_service
+from services.auth.user_management_service import get_user_management_service
 from config.config_loader import config_loader
 from services.database.database import get_db
 
@@ -99,15 +100,12 @@ class RegistrationService:
             verification_token = self.auth_service.generate_verification_token()
             registration_token = self.auth_service.create_access_token({"sub": registration_data.email})
             
-            full_name = self._build_full_name(registration_data.first_name, registration_data.last_name)
-            
             user_data = {
                 "email": registration_data.email,
                 "password_hash": hashed_password,
                 "phone_number": registration_data.phone_number,
                 "first_name": registration_data.first_name,
                 "last_name": registration_data.last_name,
-                "full_name": full_name,
                 "token": verification_token,
                 "token_expiry": datetime.now(timezone.utc) + timedelta(hours=24),
                 "status": "pending_verification",
@@ -119,6 +117,7 @@ class RegistrationService:
             user, error = self.user_repository.create_user(db, user_data)
             if error:
                 return None, error, status.HTTP_400_BAD_REQUEST
+            get_user_management_service().invalidate_user_stats()
 
             message = self.config_loader.get_message("registration", "success")
             if self.email_service.is_configured():
@@ -285,13 +284,3 @@ class RegistrationService:
                 database_connected=False,
                 version="1.0.0"
             )
-
-    def _build_full_name(self, first_name: Optional[str], last_name: Optional[str]) -> Optional[str]:
-        """Build full name from first and last name"""
-        if first_name and last_name:
-            return f"{first_name} {last_name}"
-        elif first_name:
-            return first_name
-        elif last_name:
-            return last_name
-        return None
\ No newline at end of file
@@ -1,11 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 from typing import List
 import uuid
 
-from services.database import get_db
-from services.repositories import get_question_repository
-from services.repositories import get_answer_repository
+from services.repositories import QuestionRepository, get_question_repository
+from services.repositories import AnswerRepository, get_answer_repository
 from models.schemas.request_models import QuestionCreateRequest
 from models.schemas.response_models import QuestionResponse, QuestionWithAnswersResponse, GeneralResponse
 from services.dependencies import get_current_user
@@ -18,11 +16,10 @@ router = APIRouter(prefix="/questions", tags=["Questions"])
 def create_question(
     question_data: QuestionCreateRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    question_repo: QuestionRepository = Depends(get_question_repository)
 ):
     """إنشاء سؤال جديد"""
     try:
-        question_repo = get_question_repository()
         question = question_repo.create_question(
             user_id=uuid.UUID(current_user.id),
             question=question_data.question
@@ -42,10 +39,9 @@ def create_question(
 
 
 @router.get("/", response_model=List[QuestionResponse])
-def get_all_questions(db: Session = Depends(get_db)):
+def get_all_questions(question_repo: QuestionRepository = Depends(get_question_repository)):
     """الحصول على جميع الأسئلة"""
     try:
-        question_repo = get_question_repository()
         questions = question_repo.get_all_questions()
         return [
             QuestionResponse(
@@ -65,12 +61,13 @@ def get_all_questions(db: Session = Depends(get_db)):
 
 
 @router.get("/{question_id}", response_model=QuestionWithAnswersResponse)
-def get_question_with_answers(question_id: str, db: Session = Depends(get_db)):
+def get_question_with_answers(
+    question_id: str,
+    question_repo: QuestionRepository = Depends(get_question_repository),
+    answer_repo: AnswerRepository = Depends(get_answer_repository)
+):
     """الحصول على سؤال مع إجاباته"""
     try:
-        question_repo = get_question_repository()
-        answer_repo = get_answer_repository()
-        
         question = question_repo.get_question_by_id(uuid.UUID(question_id))
         if not question:
             raise HTTPException(
@@ -110,10 +107,9 @@ def get_question_with_answers(question_id: str, db: Session = Depends(get_db)):
 
 
 @router.delete("/{question_id}", response_model=GeneralResponse)
-def delete_question(question_id: str, db: Session = Depends(get_db)):
+def delete_question(question_id: str, question_repo: QuestionRepository = Depends(get_question_repository)):
     """حذف سؤال"""
     try:
-        question_repo = get_question_repository()
         success = question_repo.delete_question(uuid.UUID(question_id))
         
         if not success:
@@ -15,7 +15,7 @@ from models.schemas.response_models import (
 )
 from services.dependencies import get_current_user
 from services.database.database import get_db
-from services.email.email_service import email_service
+from services.email.email_service import EmailService, get_email_service
 from config.logging_config import get_logger, log_function_entry, log_function_exit, log_performance, log_error_with_context
 
 logger = get_logger(__name__)
@@ -23,7 +23,7 @@ router = APIRouter(prefix="/smtp", tags=["SMTP Configuration"])
 
 
 @router.get("/providers", response_model=SMTPProvidersResponse)
-async def get_smtp_providers():
+async def get_smtp_providers(email_service: EmailService = Depends(get_email_service)):
     """
     Get all available SMTP providers and their configuration information.
     
@@ -58,7 +58,7 @@ async def get_smtp_providers():
 
 
 @router.get("/providers/{provider}", response_model=SMTPProviderInfo)
-async def get_smtp_provider_info(provider: str):
+async def get_smtp_provider_info(provider: str, email_service: EmailService = Depends(get_email_service)):
     """
     Get detailed information about a specific SMTP provider.
     
@@ -100,7 +100,7 @@ async def get_smtp_provider_info(provider: str):
 
 
 @router.post("/test", response_model=SMTPTestResponse)
-async def test_smtp_connection(request: SMTPTestRequest):
+async def test_smtp_connection(request: SMTPTestRequest, email_service: EmailService = Depends(get_email_service)):
     """
     Test SMTP connection with provided credentials.
     
@@ -131,7 +131,7 @@ async def test_smtp_connection(request: SMTPTestRequest):
         # Detect provider if not specified
         provider = request.provider
         if not provider:
-            provider = email_service.detect_provider_from_email(request.email)
+            provider = await email_service.resolve_provider(request.email)
         
         # Test SMTP connection
         success, message = await email_service.test_smtp_connection(
@@ -168,7 +168,7 @@ async def test_smtp_connection(request: SMTPTestRequest):
 
 
 @router.post("/detect-provider", response_model=SMTPTestResponse)
-async def detect_email_provider(email: str):
+async def detect_email_provider(email: str, email_service: EmailService = Depends(get_email_service)):
     """
     Detect the SMTP provider from an email address domain.
     
@@ -188,7 +188,7 @@ async def detect_email_provider(email: str):
             )
         
         # Detect provider
-        provider = email_service.detect_provider_from_email(email)
+        provider = await email_service.resolve_provider(email)
         
         # Get provider info
         provider_info = email_service.get_provider_info(provider)
@@ -210,7 +210,7 @@ async def detect_email_provider(email: str):
 
 
 @router.get("/supported-domains")
-async def get_supported_domains():
+async def get_supported_domains(email_service: EmailService = Depends(get_email_service)):
     """
     Get list of supported email domains and their corresponding providers.
     
@@ -223,7 +223,7 @@ async def get_supported_domains():
         domains = email_service.get_supported_domains()
         
         return {
-            "supported_domains": domains,
+            "supported_domains": dict(domains),
             "total_domains": len(domains)
         }
     except Exception as e:
@@ -242,7 +242,7 @@ async def get_supported_domains():
 
 
 @router.post("/configure", response_model=SMTPConfigResponse)
-async def configure_smtp_settings(request: SMTPConfigRequest):
+async def configure_smtp_settings(request: SMTPConfigRequest, email_service: EmailService = Depends(get_email_service)):
     """
     Configure SMTP settings for the application.
     
@@ -267,7 +267,7 @@ async def configure_smtp_settings(request: SMTPConfigRequest):
         # Detect provider if not specified
         provider = request.provider
         if not provider:
-            provider = email_service.detect_provider_from_email(request.email)
+            provider = await email_service.resolve_provider(request.email)
         
         # Get provider configuration
         provider_info = email_service.get_provider_info(provider)
@@ -305,7 +305,7 @@ async def configure_smtp_settings(request: SMTPConfigRequest):
 
 
 @router.get("/health")
-async def smtp_health_check():
+async def smtp_health_check(email_service: EmailService = Depends(get_email_service)):
     """
     Check SMTP service health and configuration status.
     
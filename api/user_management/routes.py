@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 
@@ -43,7 +43,9 @@ async def search_users(
             )
         
         user_service = get_user_management_service()
-        return user_service.search_users(db, search_request)
+        user_list = user_service.search_users(db, search_request)
+        # Serialize directly; the list is built from trusted rows so FastAPI's re-validation is skipped
+        return Response(content=user_list.model_dump_json(), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error searching users: {e}")
@@ -219,7 +221,7 @@ async def change_password(
             )
         
         user_service = get_user_management_service()
-        result = user_service.change_password(db, user_id, password_request)
+        result = await user_service.change_password_async(db, user_id, password_request)
         
         if not result:
             raise HTTPException(
@@ -1,6 +1,8 @@
+import functools
 import logging
 import logging.config
 import os
+import time
 from typing import Dict, Any
 
 def setup_logging() -> None:
@@ -184,6 +186,9 @@ def set_verbose_logging(module_name: str = None) -> None:
 
 def log_function_entry(logger: logging.Logger, func_name: str = None, **kwargs):
     """Decorator helper to log function entry with parameters"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    
     if not func_name:
         import inspect
         func_name = inspect.currentframe().f_back.f_code.co_name
@@ -206,6 +211,9 @@ def log_function_entry(logger: logging.Logger, func_name: str = None, **kwargs):
 
 def log_function_exit(logger: logging.Logger, func_name: str = None, result=None, duration=None):
     """Decorator helper to log function exit with result"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    
     if not func_name:
         import inspect
         func_name = inspect.currentframe().f_back.f_code.co_name
@@ -226,7 +234,31 @@ def log_performance(logger: logging.Logger, operation: str, duration: float, **c
     """Log performance metrics"""
     logger.info(f"[PERF] Performance: {operation} took {duration:.3f}s - Context: {context}")
 
+# Traced operations faster than this are not logged
+SLOW_OPERATION_SECONDS = 0.05
+
+def traced(logger: logging.Logger, operation: str):
+    """Decorator that times a call and logs it when slow; a plain call unless DEBUG is enabled"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not logger.isEnabledFor(logging.DEBUG):
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                if duration > SLOW_OPERATION_SECONDS:
+                    log_performance(logger, operation, duration)
+        return wrapper
+    return decorator
+
 def log_error_with_context(logger: logging.Logger, error: Exception, context: str = "", **kwargs):
-    """Log errors with additional context"""
-    logger.error(f"[ERROR] Error in {context}: {str(error)} - Context: {kwargs}")
-    logger.debug(f"[ERROR] Error details: {type(error).__name__}: {str(error)}")
+    """Log errors with additional context as a single record carrying the traceback"""
+    logger.error(
+        f"[ERROR] Error in {context}: {type(error).__name__}: {error} - Context: {kwargs}",
+        exc_info=error,
+        # Nested so caller kwargs (e.g. name=) cannot clash with LogRecord attributes
+        extra={"op": context, "exc": str(error), "context": kwargs}
+    )
@@ -323,6 +323,14 @@ async def startup_event():
     
     log_function_exit(logger, "startup_event", duration=time.time() - start_time)
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled outbound connections on shutdown."""
+    from services.email.email_service import get_email_service
+    from services.email.dynamic_smtp_service import get_dynamic_smtp_service
+    await get_email_service().close()
+    await get_dynamic_smtp_service().close_all()
+
 @app.get("/")
 def read_root():
     log_function_entry(logger, "read_root")
@@ -0,0 +1,66 @@
+"""Add composite indexes for chat and answer lookups
+
+Revision ID: add_chat_answer_composite_indexes
+Revises: generate_user_full_name
+Create Date: 2025-09-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_chat_answer_composite_indexes'
+down_revision = 'generate_user_full_name'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # search_chats: WHERE user_id = ? ORDER BY updated_at DESC
+        op.create_index(
+            'ix_chat_user_updated', 'chats',
+            ['user_id', sa.text('updated_at DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        # Partial indexes for the common is_archived=false / is_pinned=true filters
+        op.create_index(
+            'ix_chat_user_updated_active', 'chats',
+            ['user_id', sa.text('updated_at DESC')],
+            unique=False, postgresql_where=sa.text('is_archived = false'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_chat_user_updated_pinned', 'chats',
+            ['user_id', sa.text('updated_at DESC')],
+            unique=False, postgresql_where=sa.text('is_pinned = true'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+        # get_chat_messages: WHERE chat_id = ? AND user_id = ? ORDER BY created_at DESC
+        op.create_index(
+            'ix_chatmessage_chat_user_created', 'chat_messages',
+            ['chat_id', 'user_id', sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+        op.create_index(
+            'ix_answer_question_id', 'answers', ['question_id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_answer_user_id', 'answers', ['user_id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_answer_user_id', table_name='answers', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_answer_question_id', table_name='answers', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_chatmessage_chat_user_created', table_name='chat_messages', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_chat_user_updated_pinned', table_name='chats', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_chat_user_updated_active', table_name='chats', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_chat_user_updated', table_name='chats', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,54 @@
+"""Promote qa_pairs qa_metadata.qa_id to an indexed external_qa_id column
+
+Revision ID: add_qa_pairs_external_qa_id
+Revises: add_qa_pairs_question_trgm_index
+Create Date: 2025-09-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_qa_pairs_external_qa_id'
+down_revision = 'add_qa_pairs_question_trgm_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS so a rerun after a failed index build gets past this step
+    op.execute("ALTER TABLE qa_pairs ADD COLUMN IF NOT EXISTS external_qa_id VARCHAR(64)")
+    op.execute(
+        "UPDATE qa_pairs SET external_qa_id = qa_metadata->>'qa_id' "
+        "WHERE qa_metadata IS NOT NULL AND qa_metadata->>'qa_id' IS NOT NULL"
+    )
+    # Old qa_ids were hash(question) + epoch seconds, so repeats of a question within
+    # the same second share one; keep it on the oldest row so the unique index builds
+    op.execute(
+        "UPDATE qa_pairs SET external_qa_id = NULL FROM ("
+        "  SELECT id, row_number() OVER (PARTITION BY external_qa_id ORDER BY created_at, id) AS rn"
+        "  FROM qa_pairs WHERE external_qa_id IS NOT NULL"
+        ") dup WHERE qa_pairs.id = dup.id AND dup.rn > 1"
+    )
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # A failed concurrent build leaves an INVALID index that if_not_exists would keep
+        invalid = op.get_bind().execute(sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = 'ix_qa_pairs_external_qa_id' AND NOT i.indisvalid"
+        )).scalar()
+        if invalid:
+            op.drop_index('ix_qa_pairs_external_qa_id', table_name='qa_pairs', postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            'ix_qa_pairs_external_qa_id', 'qa_pairs', ['external_qa_id'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_qa_pairs_external_qa_id', table_name='qa_pairs', postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('qa_pairs', 'external_qa_id')
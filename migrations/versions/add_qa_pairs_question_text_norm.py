@@ -0,0 +1,44 @@
+"""Add generated lower-case question column with trigram index on qa_pairs
+
+Revision ID: add_qa_pairs_question_text_norm
+Revises: add_users_oauth_provider_id_index
+Create Date: 2025-09-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_qa_pairs_question_text_norm'
+down_revision = 'add_users_oauth_provider_id_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('qa_pairs', sa.Column(
+        'question_text_norm', sa.Text(), sa.Computed('lower(question_text)', persisted=True), nullable=True
+    ))
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'qa_norm_trgm', 'qa_pairs', ['question_text_norm'],
+            unique=False, postgresql_using='gin', postgresql_ops={'question_text_norm': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # find_similar_questions now queries question_text_norm only
+        op.drop_index('qa_question_trgm_idx', table_name='qa_pairs', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'qa_question_trgm_idx', 'qa_pairs', ['question_text'],
+            unique=False, postgresql_using='gin', postgresql_ops={'question_text': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('qa_norm_trgm', table_name='qa_pairs', postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('qa_pairs', 'question_text_norm')
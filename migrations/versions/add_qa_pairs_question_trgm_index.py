@@ -0,0 +1,34 @@
+"""Add trigram index for similar-question lookups on qa_pairs
+
+Revision ID: add_qa_pairs_question_trgm_index
+Revises: add_chat_answer_composite_indexes
+Create Date: 2025-09-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_qa_pairs_question_trgm_index'
+down_revision = 'add_chat_answer_composite_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Serves both the % similarity operator and ILIKE '%...%' in find_similar_questions
+        op.create_index(
+            'qa_question_trgm_idx', 'qa_pairs', ['question_text'],
+            unique=False, postgresql_using='gin', postgresql_ops={'question_text': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('qa_question_trgm_idx', table_name='qa_pairs', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,62 @@
+"""Add indexes supporting user search and stats
+
+Revision ID: add_user_search_indexes
+Revises: add_chat_tables, add_qa_pairs_table
+Create Date: 2025-09-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_search_indexes'
+down_revision = ('add_chat_tables', 'add_qa_pairs_table')
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Keyset pagination order for search_users: (created_at DESC, id DESC)
+        op.create_index(
+            'ix_users_created_at_id', 'users',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_users_status_created', 'users',
+            ['status', sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+        # Trigram indexes for the ILIKE '%...%' email/phone filters
+        op.create_index(
+            'ix_users_email_trgm', 'users', ['email'],
+            unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_users_phone_number_trgm', 'users', ['phone_number'],
+            unique=False, postgresql_using='gin', postgresql_ops={'phone_number': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+        # Partial index for the oauth_provider filter and the stats oauth count
+        op.create_index(
+            'ix_users_oauth_provider', 'users', ['oauth_provider'],
+            unique=False, postgresql_where=sa.text('oauth_provider IS NOT NULL'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_oauth_provider', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_phone_number_trgm', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_email_trgm', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_status_created', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_created_at_id', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,32 @@
+"""Add composite index for OAuth provider lookups on users
+
+Revision ID: add_users_oauth_provider_id_index
+Revises: add_qa_pairs_external_qa_id
+Create Date: 2025-09-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_users_oauth_provider_id_index'
+down_revision = 'add_qa_pairs_external_qa_id'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # find_user_by_oauth / find_user_by_email_or_oauth: (oauth_provider, oauth_provider_id) equality
+        op.create_index(
+            'ix_users_oauth_provider_id', 'users', ['oauth_provider', 'oauth_provider_id'],
+            unique=False, postgresql_where=sa.text('oauth_provider_id IS NOT NULL'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_oauth_provider_id', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,34 @@
+"""Store users.oauth_data as JSONB
+
+Revision ID: convert_users_oauth_data_jsonb
+Revises: add_qa_pairs_question_text_norm
+Create Date: 2025-09-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'convert_users_oauth_data_jsonb'
+down_revision = 'add_qa_pairs_question_text_norm'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing values were written with json.dumps, so they cast cleanly
+    op.alter_column(
+        'users', 'oauth_data',
+        existing_type=sa.Text(), type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=True, postgresql_using='oauth_data::jsonb'
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'users', 'oauth_data',
+        existing_type=postgresql.JSONB(astext_type=sa.Text()), type_=sa.Text(),
+        existing_nullable=True, postgresql_using='oauth_data::text'
+    )
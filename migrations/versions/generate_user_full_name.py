@@ -0,0 +1,49 @@
+"""Generate users.full_name from first_name and last_name
+
+Revision ID: generate_user_full_name
+Revises: add_user_search_indexes
+Create Date: 2025-09-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'generate_user_full_name'
+down_revision = 'add_user_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+FULL_NAME_EXPRESSION = "NULLIF(TRIM(COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')), '')"
+
+
+def upgrade() -> None:
+    # Users that only ever had full_name (e.g. OAuth signups) keep it as first/last name
+    op.execute(
+        "UPDATE users SET "
+        "first_name = split_part(TRIM(full_name), ' ', 1), "
+        "last_name = NULLIF(TRIM(substr(TRIM(full_name), length(split_part(TRIM(full_name), ' ', 1)) + 1)), '') "
+        "WHERE first_name IS NULL AND last_name IS NULL AND NULLIF(TRIM(full_name), '') IS NOT NULL"
+    )
+    op.drop_column('users', 'full_name')
+    op.add_column('users', sa.Column(
+        'full_name', sa.Text(), sa.Computed(FULL_NAME_EXPRESSION, persisted=True), nullable=True
+    ))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_full_name_trgm', 'users', ['full_name'],
+            unique=False, postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_full_name_trgm', table_name='users', postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('users', 'full_name')
+    op.add_column('users', sa.Column('full_name', sa.String(length=200), nullable=True))
+    op.execute(f"UPDATE users SET full_name = {FULL_NAME_EXPRESSION}")
@@ -1,17 +1,30 @@
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from sqlalchemy import Column, String, Text, Integer, Float, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, Integer, Float, Boolean, DateTime, ForeignKey, JSON, Index, text
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
 from .base import Base
 
 
+# Set by the database on UPDATE, as naive UTC like the datetime.utcnow insert defaults
+_utc_now = func.timezone("utc", func.now())
+
+
 class Chat(Base):
     """Chat domain model for AI conversations"""
     
     __tablename__ = "chats"
+    __table_args__ = (
+        # search_chats: WHERE user_id = ? ORDER BY updated_at DESC, plus the common archived/pinned filters
+        Index("ix_chat_user_updated", "user_id", text("updated_at DESC")),
+        Index("ix_chat_user_updated_active", "user_id", text("updated_at DESC"),
+              postgresql_where=text("is_archived = false")),
+        Index("ix_chat_user_updated_pinned", "user_id", text("updated_at DESC"),
+              postgresql_where=text("is_pinned = true")),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -27,10 +40,14 @@ class Chat(Base):
     is_pinned = Column(Boolean, default=False, nullable=False)
     last_message_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=_utc_now, nullable=False)
     
     # Relationships
-    messages = relationship("ChatMessage", back_populates="chat", cascade="all, delete-orphan")
+    # Newest first, matching how get_chat_with_messages pages the history
+    messages = relationship(
+        "ChatMessage", back_populates="chat", cascade="all, delete-orphan",
+        order_by="desc(ChatMessage.created_at)"
+    )
     user = relationship("User", back_populates="chats")
     
     def __repr__(self):
@@ -61,6 +78,10 @@ class ChatMessage(Base):
     """Chat message domain model"""
     
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # get_chat_messages: WHERE chat_id = ? AND user_id = ? ORDER BY created_at DESC
+        Index("ix_chatmessage_chat_user_created", "chat_id", "user_id", text("created_at DESC")),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     chat_id = Column(UUID(as_uuid=True), ForeignKey("chats.id"), nullable=False)
@@ -165,7 +186,7 @@ class ChatSettings(Base):
     enable_analytics = Column(Boolean, default=True, nullable=False)
     enable_feedback = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=_utc_now, nullable=False)
     
     # Relationships
     user = relationship("User", back_populates="chat_settings")
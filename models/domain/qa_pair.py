@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, Float, Text, JSON
+from sqlalchemy import Column, String, DateTime, Float, Text, JSON, Index, Computed
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from .base import Base
@@ -10,15 +10,27 @@ class QAPair(Base):
     This replaces the separate Question and Answer models for the intelligent Q&A system.
     """
     __tablename__ = "qa_pairs"
+    # Fetch server-generated timestamps via RETURNING on flush instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # pg_trgm index for find_similar_questions (% operator and LIKE '%...%')
+        Index(
+            "qa_norm_trgm", "question_text_norm",
+            postgresql_using="gin", postgresql_ops={"question_text_norm": "gin_trgm_ops"}
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     question_text = Column(Text, nullable=False)
+    # Lower-cased copy generated by the database, so lookups need no per-row lower()/ILIKE
+    question_text_norm = Column(Text, Computed("lower(question_text)", persisted=True))
     answer_text = Column(Text, nullable=False)
     user_id = Column(UUID(as_uuid=True), nullable=True)  # Optional, for user-specific Q&A
     confidence = Column(Float, default=0.8)
     source = Column(String(50), default="gemini_api")  # gemini_api, vector_search, etc.
     language = Column(String(10), default="auto")
     qa_metadata = Column(JSON, nullable=True)  # Store additional metadata as JSON
+    external_qa_id = Column(String(64), nullable=True, unique=True, index=True)  # qa_id shared with Qdrant
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
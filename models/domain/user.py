@@ -1,12 +1,14 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Computed
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .base import Base
 
 class User(Base):
     __tablename__ = "users"
+    # Fetch server-generated values (full_name, onupdate timestamps) via RETURNING on flush
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False)
@@ -14,13 +16,18 @@ class User(Base):
     phone_number = Column(String(20), unique=True, nullable=True)
     first_name = Column(String(100), nullable=True)
     last_name = Column(String(100), nullable=True)
-    full_name = Column(String(200), nullable=True)
+    # Generated by the database from first_name/last_name; never assign directly
+    full_name = Column(
+        Text,
+        Computed("NULLIF(TRIM(COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')), '')", persisted=True),
+        nullable=True
+    )
     profile_picture = Column(String(500), nullable=True)
     
     # OAuth fields
     oauth_provider = Column(String(50), nullable=True)
     oauth_provider_id = Column(String(100), nullable=True)
-    oauth_data = Column(Text, nullable=True)
+    oauth_data = Column(JSONB, nullable=True)  # Raw provider profile, stored as-is
     oauth_access_token = Column(Text, nullable=True)  # Store OAuth access token
     oauth_refresh_token = Column(Text, nullable=True)  # Store OAuth refresh token
     oauth_token_expires_at = Column(DateTime(timezone=True), nullable=True)  # OAuth token expiry
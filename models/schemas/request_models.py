@@ -3,6 +3,7 @@ from typing import Optional, List
 from pydantic import BaseModel, EmailStr, Field, validator
 import re
 import time
+import uuid
 import logging
 from config.logging_config import (
     get_logger,
@@ -266,6 +267,10 @@ class UserSearchRequest(BaseModel):
     created_before: Optional[datetime] = None
     page: int = Field(1, ge=1)
     page_size: int = Field(10, ge=1, le=100)
+    # Keyset cursor from a previous page's next_cursor; when set, page is ignored for offsetting
+    cursor_created_at: Optional[datetime] = None
+    cursor_id: Optional[uuid.UUID] = None
+    include_count: bool = False
 
 
 class UserBulkActionRequest(BaseModel):
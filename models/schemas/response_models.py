@@ -128,12 +128,18 @@ class UserDetailResponse(BaseModel):
     settings: Dict[str, Any]
 
 
+class UserListCursor(BaseModel):
+    created_at: datetime
+    id: str
+
+
 class UserListResponse(BaseModel):
     users: List[UserResponse]
-    total_count: int
+    total_count: Optional[int]
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
+    next_cursor: Optional[UserListCursor] = None
 
 
 class UserStatsResponse(BaseModel):
@@ -347,12 +353,18 @@ class ChatDetailResponse(BaseModel):
     analytics: Optional[Dict[str, Any]]
 
 
+class ChatListCursor(BaseModel):
+    updated_at: datetime
+    id: str
+
+
 class ChatListResponse(BaseModel):
     chats: List[ChatResponse]
-    total_count: int
+    total_count: Optional[int]
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
+    next_cursor: Optional[ChatListCursor] = None
 
 
 class ChatCreateResponse(BaseModel):
@@ -269,6 +269,11 @@ class ChatManagementService:
             chat_repository = ChatRepository(db)
             
             chats, total_count = chat_repository.search_chats(user_id, **filters)
+            page_size = filters.get("page_size", 10)
+            
+            next_cursor = None
+            if chats and len(chats) == page_size:
+                next_cursor = {"updated_at": chats[-1].updated_at, "id": str(chats[-1].id)}
             
             response = {
                 "status": "success",
@@ -277,8 +282,9 @@ class ChatManagementService:
                     "chats": [chat.to_dict() for chat in chats],
                     "total_count": total_count,
                     "page": filters.get("page", 1),
-                    "page_size": filters.get("page_size", 10),
-                    "total_pages": (total_count + filters.get("page_size", 10) - 1) // filters.get("page_size", 10)
+                    "page_size": page_size,
+                    "total_pages": (total_count + page_size - 1) // page_size if total_count is not None else None,
+                    "next_cursor": next_cursor
                 }
             }
             
@@ -1,16 +1,21 @@
 import json
 import logging
 import time
-import asyncio
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import os
 
-from services.database.redis_service import redis_service
+from services.database.redis_service import redis_service, SCAN_COUNT
 from .qdrant_service import qdrant_service
 from .embedding_service import embedding_service
 from config.logging_config import get_logger
 
+# orjson is optional; both parsers accept the raw file bytes
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = get_logger(__name__)
 
 class DataIntegrationService:
@@ -100,8 +105,10 @@ class DataIntegrationService:
                     file_stats[filename] = 0
             
             # Cache metadata
-            redis_service.client.set("syria:metadata:total_items", total_cached)
-            redis_service.client.set("syria:metadata:last_updated", str(asyncio.get_event_loop().time()))
+            pipe = redis_service.client.pipeline(transaction=False)
+            pipe.set("syria:metadata:total_items", total_cached)
+            pipe.set("syria:metadata:last_updated", str(time.time()))
+            pipe.execute()
             
             return {
                 "status": "success",
@@ -147,54 +154,13 @@ class DataIntegrationService:
     
     async def _cache_json_file_redis(self, file_path: Path) -> int:
         """Cache a single JSON file's content into Redis"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            category = data.get("category", file_path.stem)
-            qa_pairs = data.get("qa_pairs", [])
-            
-            cached_count = 0
-            
-            for qa_pair in qa_pairs:
-                qa_id = qa_pair.get("id")
-                if qa_id:
-                    # Cache the full Q&A pair
-                    redis_service.client.hset(f"syria:qa:{qa_id}", mapping={
-                        "question_variants": json.dumps(qa_pair.get("question_variants", []), ensure_ascii=False),
-                        "answer": qa_pair.get("answer", ""),
-                        "keywords": json.dumps(qa_pair.get("keywords", []), ensure_ascii=False),
-                        "confidence": str(qa_pair.get("confidence", 1.0)),
-                        "source": qa_pair.get("source", ""),
-                        "category": category
-                    })
-                    
-                    # Create keyword indexes for fast searching
-                    for keyword in qa_pair.get("keywords", []):
-                        redis_service.client.sadd(f"syria:keyword:{keyword.lower()}", qa_id)
-                    
-                    # Create category index
-                    redis_service.client.sadd(f"syria:category:{category}", qa_id)
-                    
-                    cached_count += 1
-            
-            # Cache category metadata
-            redis_service.client.hset(f"syria:category_info:{category}", mapping={
-                "description": data.get("description", ""),
-                "total_items": str(len(qa_pairs))
-            })
-            
-            return cached_count
-            
-        except Exception as e:
-            logger.error(f"❌ Error caching file {file_path}: {e}")
-            return 0
+        # Delegate to RedisService so the record layout and indexes stay in one place
+        return redis_service.cache_json_file(file_path)
     
     async def _load_json_file_to_qdrant(self, file_path: Path) -> int:
         """Load a single JSON file's content into Qdrant vector database"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _json_loads(file_path.read_bytes())
             
             category = data.get("category", file_path.stem)
             qa_pairs = data.get("qa_pairs", [])
@@ -223,7 +189,7 @@ class DataIntegrationService:
                     # Prepare metadata
                     metadata = {
                         "category": category,
-                        "confidence": qa_pair.get("confidence", 1.0),
+                        "confidence": float(qa_pair.get("confidence", 1.0)),
                         "keywords": qa_pair.get("keywords", []),
                         "source": qa_pair.get("source", "syria_knowledge"),
                         "question_variants": qa_pair.get("question_variants", []),
@@ -278,11 +244,18 @@ class DataIntegrationService:
         try:
             # Clear Redis data
             if redis_service.is_connected():
-                # Get all Syria-related keys
-                syria_keys = redis_service.client.keys("syria:*")
-                if syria_keys:
-                    redis_service.client.delete(*syria_keys)
-                    logger.info(f"🗑️ Cleared {len(syria_keys)} Redis keys")
+                # Walk Syria-related keys with SCAN so Redis is never blocked by KEYS
+                cleared = 0
+                batch = []
+                for key in redis_service.client.scan_iter(match="syria:*", count=SCAN_COUNT):
+                    batch.append(key)
+                    if len(batch) >= SCAN_COUNT:
+                        cleared += redis_service.client.unlink(*batch)
+                        batch = []
+                if batch:
+                    cleared += redis_service.client.unlink(*batch)
+                if cleared:
+                    logger.info(f"🗑️ Cleared {cleared} Redis keys")
             
             # Clear Qdrant collection
             if qdrant_service.is_connected():
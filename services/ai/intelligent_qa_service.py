@@ -363,8 +363,8 @@ class IntelligentQAService:
         Store the new Q&A pair in both PostgreSQL and Qdrant.
         """
         try:
-            # Generate unique Q&A ID
-            qa_id = f"qa_{abs(hash(question))}_{int(time.time())}"
+            # Generate unique Q&A ID (stored as the unique qa_pairs.external_qa_id)
+            qa_id = f"qa_{uuid.uuid4().hex}"
             
             # Store in PostgreSQL
             db = next(get_db())
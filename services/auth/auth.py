@@ -18,13 +18,23 @@ logger = get_logger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# New hashes use argon2id; legacy bcrypt hashes still verify and are flagged for rehash
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=2,
+)
+
 class AuthService:
     def __init__(self):
         log_function_entry(logger, "__init__")
         start_time = time.time()
         
         logger.debug("🔧 Initializing AuthService...")
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = pwd_context
         self.secret_key = os.getenv("SECRET_KEY")
         if not self.secret_key:
             logger.error("❌ SECRET_KEY environment variable must be set")
@@ -76,6 +86,10 @@ class AuthService:
             log_function_exit(logger, "verify_password", duration=duration)
             raise
 
+    def password_needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a stored hash uses a deprecated scheme or outdated parameters"""
+        return self.pwd_context.needs_update(hashed_password)
+
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         log_function_entry(logger, "create_access_token", data_keys=list(data.keys()), has_expires_delta=expires_delta is not None)
         start_time = time.time()
@@ -1,11 +1,15 @@
+import asyncio
 import logging
+import os
 import time
 import uuid
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from datetime import datetime, timedelta, time as dt_time
 from typing import Dict, List, Optional, Tuple, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
-from passlib.context import CryptContext
+from sqlalchemy import and_, or_, func, desc, asc, select, update, lambda_stmt, tuple_, bindparam
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from models.domain.user import User
 from models.schemas.request_models import (
@@ -13,14 +17,44 @@ from models.schemas.request_models import (
     UserSearchRequest, UserBulkActionRequest, UserSettingsRequest
 )
 from models.schemas.response_models import (
-    UserResponse, UserDetailResponse, UserListResponse, UserStatsResponse,
+    UserResponse, UserDetailResponse, UserListResponse, UserListCursor, UserStatsResponse,
     UserUpdateResponse, UserPasswordChangeResponse, UserBulkActionResponse
 )
 from services.repositories import get_user_repository
+from services.database.redis_service import redis_service
+from services.auth.session_management_service import get_session_management_service
+from services.auth.auth import pwd_context
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing is CPU-bound and releases the GIL, so it runs off the event loop on a core-sized pool
+_PASSWORD_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="password-hash")
+
+# Admin dashboard stats are cached briefly; writes that change them invalidate the key
+USER_STATS_CACHE_KEY = "user_stats:v1"
+USER_STATS_CACHE_TTL = 60
+SEARCH_USERS_YIELD_PER = 100
+
+# Column values applied by each non-delete bulk action
+_BULK_ACTION_VALUES = MappingProxyType({
+    "activate": {"status": "active"},
+    "suspend": {"status": "suspended"},
+    "ban": {"status": "banned"},
+    "verify_email": {"is_email_verified": True},
+    "verify_phone": {"is_phone_verified": True},
+})
+
+# Default settings until a user_settings table exists; read-only, callers receive a copy
+_DEFAULT_SETTINGS = MappingProxyType({
+    "email_notifications": True,
+    "sms_notifications": False,
+    "two_factor_enabled": False,
+    "session_timeout_hours": 24,
+    "max_concurrent_sessions": 5,
+    "language": "en",
+    "timezone": "UTC",
+    "theme": "light"
+})
 
 
 class UserManagementService:
@@ -30,30 +64,41 @@ class UserManagementService:
     
     def __init__(self):
         self.user_repo = get_user_repository()
+        self.redis = redis_service
+        self.session_service = get_session_management_service()
+    
+    def invalidate_user_stats(self) -> None:
+        """Drop the cached user statistics so the next read recomputes them"""
+        self.redis.delete_custom_data(USER_STATS_CACHE_KEY)
+    
+    @staticmethod
+    def _user_to_response(user: User) -> UserResponse:
+        """Build a UserResponse from a loaded User row without re-validating trusted DB data"""
+        return UserResponse.model_construct(
+            id=str(user.id),
+            email=user.email,
+            phone_number=user.phone_number,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            full_name=user.full_name,
+            profile_picture=user.profile_picture,
+            oauth_provider=user.oauth_provider,
+            oauth_provider_id=user.oauth_provider_id,
+            two_factor_enabled=user.two_factor_enabled,
+            is_email_verified=user.is_email_verified,
+            is_phone_verified=user.is_phone_verified,
+            status=user.status,
+            last_login_at=user.last_login_at,
+            created_at=user.created_at,
+            updated_at=user.updated_at
+        )
     
     def get_user_by_id(self, db: Session, user_id: str) -> Optional[UserResponse]:
         """Get user by ID"""
         try:
             user = self.user_repo.get_user_by_id(db, user_id)
             if user:
-                return UserResponse(
-                    id=str(user.id),
-                    email=user.email,
-                    phone_number=user.phone_number,
-                    first_name=user.first_name,
-                    last_name=user.last_name,
-                    full_name=user.full_name,
-                    profile_picture=user.profile_picture,
-                    oauth_provider=user.oauth_provider,
-                    oauth_provider_id=user.oauth_provider_id,
-                    two_factor_enabled=user.two_factor_enabled,
-                    is_email_verified=user.is_email_verified,
-                    is_phone_verified=user.is_phone_verified,
-                    status=user.status,
-                    last_login_at=user.last_login_at,
-                    created_at=user.created_at,
-                    updated_at=user.updated_at
-                )
+                return self._user_to_response(user)
             return None
         except Exception as e:
             logger.error(f"Error getting user by ID {user_id}: {e}")
@@ -67,32 +112,13 @@ class UserManagementService:
                 return None
             
             # Get session statistics
-            from services.auth.session_management_service import SessionManagementService
-            session_service = SessionManagementService()
-            session_stats = session_service.get_user_session_stats(db, user_id)
+            session_stats = self.session_service.get_user_session_stats(db, user_id)
             
             # Get user settings
             settings = self.get_user_settings(db, user_id)
             
             return UserDetailResponse(
-                user=UserResponse(
-                    id=str(user.id),
-                    email=user.email,
-                    phone_number=user.phone_number,
-                    first_name=user.first_name,
-                    last_name=user.last_name,
-                    full_name=user.full_name,
-                    profile_picture=user.profile_picture,
-                    oauth_provider=user.oauth_provider,
-                    oauth_provider_id=user.oauth_provider_id,
-                    two_factor_enabled=user.two_factor_enabled,
-                    is_email_verified=user.is_email_verified,
-                    is_phone_verified=user.is_phone_verified,
-                    status=user.status,
-                    last_login_at=user.last_login_at,
-                    created_at=user.created_at,
-                    updated_at=user.updated_at
-                ),
+                user=self._user_to_response(user),
                 active_sessions_count=session_stats.get('active_sessions', 0),
                 total_sessions_count=session_stats.get('total_sessions', 0),
                 last_activity=session_stats.get('last_activity'),
@@ -102,79 +128,106 @@ class UserManagementService:
             logger.error(f"Error getting user detail for {user_id}: {e}")
             return None
     
+    @staticmethod
+    def _search_filter_params(search_request: UserSearchRequest) -> Dict[str, Any]:
+        """Bind values for the active search filters, keyed by bindparam name"""
+        params = {
+            "email_pattern": f"%{search_request.email}%" if search_request.email else None,
+            "phone_pattern": f"%{search_request.phone_number}%" if search_request.phone_number else None,
+            "status": search_request.status or None,
+            "oauth_provider": search_request.oauth_provider or None,
+            "is_email_verified": search_request.is_email_verified,
+            "is_phone_verified": search_request.is_phone_verified,
+            "two_factor_enabled": search_request.two_factor_enabled,
+            "created_after": search_request.created_after or None,
+            "created_before": search_request.created_before or None,
+        }
+        return {name: value for name, value in params.items() if value is not None}
+    
+    @staticmethod
+    def _apply_search_filters(stmt: StatementLambdaElement, params: Dict[str, Any]) -> StatementLambdaElement:
+        """Append the active search filters to a lambda statement as named bind parameters"""
+        if "email_pattern" in params:
+            stmt += lambda s: s.where(User.email.ilike(bindparam("email_pattern")))
+        
+        if "phone_pattern" in params:
+            stmt += lambda s: s.where(User.phone_number.ilike(bindparam("phone_pattern")))
+        
+        if "status" in params:
+            stmt += lambda s: s.where(User.status == bindparam("status"))
+        
+        if "oauth_provider" in params:
+            stmt += lambda s: s.where(User.oauth_provider == bindparam("oauth_provider"))
+        
+        if "is_email_verified" in params:
+            stmt += lambda s: s.where(User.is_email_verified == bindparam("is_email_verified"))
+        
+        if "is_phone_verified" in params:
+            stmt += lambda s: s.where(User.is_phone_verified == bindparam("is_phone_verified"))
+        
+        if "two_factor_enabled" in params:
+            stmt += lambda s: s.where(User.two_factor_enabled == bindparam("two_factor_enabled"))
+        
+        if "created_after" in params:
+            stmt += lambda s: s.where(User.created_at >= bindparam("created_after"))
+        
+        if "created_before" in params:
+            stmt += lambda s: s.where(User.created_at <= bindparam("created_before"))
+        
+        return stmt
+    
     def search_users(self, db: Session, search_request: UserSearchRequest) -> UserListResponse:
         """Search and filter users with pagination"""
         try:
-            # Build query filters
-            filters = []
-            
-            if search_request.email:
-                filters.append(User.email.ilike(f"%{search_request.email}%"))
-            
-            if search_request.phone_number:
-                filters.append(User.phone_number.ilike(f"%{search_request.phone_number}%"))
-            
-            if search_request.status:
-                filters.append(User.status == search_request.status)
-            
-            if search_request.oauth_provider:
-                filters.append(User.oauth_provider == search_request.oauth_provider)
-            
-            if search_request.is_email_verified is not None:
-                filters.append(User.is_email_verified == search_request.is_email_verified)
-            
-            if search_request.is_phone_verified is not None:
-                filters.append(User.is_phone_verified == search_request.is_phone_verified)
-            
-            if search_request.two_factor_enabled is not None:
-                filters.append(User.two_factor_enabled == search_request.two_factor_enabled)
-            
-            if search_request.created_after:
-                filters.append(User.created_at >= search_request.created_after)
-            
-            if search_request.created_before:
-                filters.append(User.created_at <= search_request.created_before)
-            
-            # Get total count
-            total_count = db.query(User).filter(and_(*filters)).count()
-            
-            # Calculate pagination
-            offset = (search_request.page - 1) * search_request.page_size
-            total_pages = (total_count + search_request.page_size - 1) // search_request.page_size
-            
-            # Get users with pagination
-            users = db.query(User).filter(and_(*filters)).order_by(
-                desc(User.created_at)
-            ).offset(offset).limit(search_request.page_size).all()
-            
-            # Convert to response models
+            page_size = search_request.page_size
+            params = self._search_filter_params(search_request)
+            uses_cursor = search_request.cursor_created_at is not None and search_request.cursor_id is not None
+            
+            # COUNT is only needed for the first page or when explicitly requested
+            total_count = None
+            total_pages = None
+            if (search_request.page == 1 and not uses_cursor) or search_request.include_count:
+                # Filters are appended as lambdas so each filter combination compiles once
+                count_stmt = self._apply_search_filters(
+                    lambda_stmt(lambda: select(func.count(User.id))), params
+                )
+                total_count = db.execute(count_stmt, params).scalar_one()
+                total_pages = (total_count + page_size - 1) // page_size
+            
+            # Get users with keyset pagination on (created_at, id), falling back to offset
+            users_stmt = self._apply_search_filters(lambda_stmt(lambda: select(User)), params)
+            if uses_cursor:
+                cursor_created_at = search_request.cursor_created_at
+                cursor_id = search_request.cursor_id
+                users_stmt += lambda s: s.where(
+                    tuple_(User.created_at, User.id) < tuple_(cursor_created_at, cursor_id)
+                )
+            users_stmt += lambda s: s.order_by(desc(User.created_at), desc(User.id))
+            if uses_cursor:
+                users_stmt += lambda s: s.limit(page_size)
+            else:
+                offset = (search_request.page - 1) * page_size
+                users_stmt += lambda s: s.offset(offset).limit(page_size)
+            
+            # Stream rows straight into response models instead of materializing an ORM list first
             user_responses = []
-            for user in users:
-                user_responses.append(UserResponse(
-                    id=str(user.id),
-                    email=user.email,
-                    phone_number=user.phone_number,
-                    first_name=user.first_name,
-                    last_name=user.last_name,
-                    full_name=user.full_name,
-                    profile_picture=user.profile_picture,
-                    oauth_provider=user.oauth_provider,
-                    oauth_provider_id=user.oauth_provider_id,
-                    two_factor_enabled=user.two_factor_enabled,
-                    is_email_verified=user.is_email_verified,
-                    is_phone_verified=user.is_phone_verified,
-                    status=user.status,
-                    last_login_at=user.last_login_at,
-                    created_at=user.created_at,
-                    updated_at=user.updated_at
-                ))
+            last_user = None
+            for last_user in db.execute(
+                users_stmt, params, execution_options={"yield_per": SEARCH_USERS_YIELD_PER}
+            ).scalars():
+                user_responses.append(self._user_to_response(last_user))
             
-            return UserListResponse(
+            next_cursor = None
+            if last_user is not None and len(user_responses) == page_size:
+                next_cursor = UserListCursor(created_at=last_user.created_at, id=str(last_user.id))
+            
+            return UserListResponse.model_construct(
                 users=user_responses,
                 total_count=total_count,
                 page=search_request.page,
-                page_size=search_request.page_size,
-                total_pages=total_pages
+                page_size=page_size,
+                total_pages=total_pages,
+                next_cursor=next_cursor
             )
             
         except Exception as e:
@@ -207,39 +260,20 @@ class UserManagementService:
             if update_request.profile_picture is not None:
                 user.profile_picture = update_request.profile_picture
             
-            # Update full name if first or last name changed
-            if update_request.first_name or update_request.last_name:
-                first_name = update_request.first_name or user.first_name or ""
-                last_name = update_request.last_name or user.last_name or ""
-                user.full_name = f"{first_name} {last_name}".strip()
+            user.updated_at = func.now()
             
-            user.updated_at = datetime.utcnow()
+            # Flush so the generated full_name comes back via RETURNING, then build
+            # the response before commit expires the row so no reload SELECT is issued
+            db.flush()
+            response = UserUpdateResponse(
+                user=self._user_to_response(user),
+                message="User updated successfully"
+            )
             
             # Save changes
             db.commit()
-            db.refresh(user)
-            
-            return UserUpdateResponse(
-                user=UserResponse(
-                    id=str(user.id),
-                    email=user.email,
-                    phone_number=user.phone_number,
-                    first_name=user.first_name,
-                    last_name=user.last_name,
-                    full_name=user.full_name,
-                    profile_picture=user.profile_picture,
-                    oauth_provider=user.oauth_provider,
-                    oauth_provider_id=user.oauth_provider_id,
-                    two_factor_enabled=user.two_factor_enabled,
-                    is_email_verified=user.is_email_verified,
-                    is_phone_verified=user.is_phone_verified,
-                    status=user.status,
-                    last_login_at=user.last_login_at,
-                    created_at=user.created_at,
-                    updated_at=user.updated_at
-                ),
-                message="User updated successfully"
-            )
+            
+            return response
             
         except Exception as e:
             logger.error(f"Error updating user {user_id}: {e}")
@@ -249,75 +283,98 @@ class UserManagementService:
     def change_password(self, db: Session, user_id: str, password_request: UserPasswordChangeRequest) -> Optional[UserPasswordChangeResponse]:
         """Change user password"""
         try:
-            user = self.user_repo.get_user_by_id(db, user_id)
-            if not user:
+            user_row = self.user_repo.get_user_for_password_check(db, user_id)
+            if not user_row:
                 return None
             
             # Verify current password
-            if not pwd_context.verify(password_request.current_password, user.password_hash):
+            if not pwd_context.verify(password_request.current_password, user_row.password_hash):
                 return None
             
             # Hash new password
             new_password_hash = pwd_context.hash(password_request.new_password)
             
-            # Update password
-            user.password_hash = new_password_hash
-            user.last_password_change = datetime.utcnow()
-            user.updated_at = datetime.utcnow()
+            return self._save_new_password(db, user_row.id, new_password_hash)
             
-            # Save changes
-            db.commit()
+        except Exception as e:
+            logger.error(f"Error changing password for user {user_id}: {e}")
+            db.rollback()
+            return None
+    
+    async def change_password_async(self, db: Session, user_id: str, password_request: UserPasswordChangeRequest) -> Optional[UserPasswordChangeResponse]:
+        """Change user password with hashing work offloaded from the event loop"""
+        try:
+            user_row = self.user_repo.get_user_for_password_check(db, user_id)
+            if not user_row:
+                return None
             
-            return UserPasswordChangeResponse(
-                message="Password changed successfully",
-                password_changed_at=user.last_password_change
+            loop = asyncio.get_running_loop()
+            
+            # Verify current password
+            is_valid = await loop.run_in_executor(
+                _PASSWORD_HASH_POOL, pwd_context.verify, password_request.current_password, user_row.password_hash
             )
+            if not is_valid:
+                return None
+            
+            # Hash new password
+            new_password_hash = await loop.run_in_executor(
+                _PASSWORD_HASH_POOL, pwd_context.hash, password_request.new_password
+            )
+            
+            return self._save_new_password(db, user_row.id, new_password_hash)
             
         except Exception as e:
             logger.error(f"Error changing password for user {user_id}: {e}")
             db.rollback()
             return None
     
+    def _save_new_password(self, db: Session, user_id: uuid.UUID, new_password_hash: str) -> UserPasswordChangeResponse:
+        """Persist a freshly hashed password without loading the full user row"""
+        changed_at = datetime.utcnow()
+        db.execute(
+            update(User).where(User.id == user_id).values(
+                password_hash=new_password_hash,
+                last_password_change=changed_at,
+                updated_at=changed_at
+            )
+        )
+        
+        # Save changes
+        db.commit()
+        
+        return UserPasswordChangeResponse(
+            message="Password changed successfully",
+            password_changed_at=changed_at
+        )
+    
     def update_user_status(self, db: Session, user_id: str, status_request: UserStatusUpdateRequest) -> Optional[UserUpdateResponse]:
         """Update user status"""
         try:
-            user = self.user_repo.get_user_by_id(db, user_id)
+            # Update and fetch the row in one round trip
+            user = db.execute(
+                update(User).where(User.id == user_id).values(
+                    status=status_request.status,
+                    updated_at=func.now()
+                ).returning(User)
+            ).scalar_one_or_none()
             if not user:
+                db.rollback()
                 return None
             
-            user.status = status_request.status
-            user.updated_at = datetime.utcnow()
+            response = UserUpdateResponse(
+                user=self._user_to_response(user),
+                message=f"User status updated to {status_request.status}"
+            )
             
             # If user is banned or suspended, revoke all active sessions
             if status_request.status in ['banned', 'suspended']:
-                from services.auth.session_management_service import SessionManagementService
-                session_service = SessionManagementService()
-                session_service.revoke_all_user_sessions(db, user_id)
+                self.session_service.revoke_all_user_sessions(db, user_id)
             
             db.commit()
-            db.refresh(user)
-            
-            return UserUpdateResponse(
-                user=UserResponse(
-                    id=str(user.id),
-                    email=user.email,
-                    phone_number=user.phone_number,
-                    first_name=user.first_name,
-                    last_name=user.last_name,
-                    full_name=user.full_name,
-                    profile_picture=user.profile_picture,
-                    oauth_provider=user.oauth_provider,
-                    oauth_provider_id=user.oauth_provider_id,
-                    two_factor_enabled=user.two_factor_enabled,
-                    is_email_verified=user.is_email_verified,
-                    is_phone_verified=user.is_phone_verified,
-                    status=user.status,
-                    last_login_at=user.last_login_at,
-                    created_at=user.created_at,
-                    updated_at=user.updated_at
-                ),
-                message=f"User status updated to {status_request.status}"
-            )
+            self.invalidate_user_stats()
+            
+            return response
             
         except Exception as e:
             logger.error(f"Error updating user status for {user_id}: {e}")
@@ -327,39 +384,42 @@ class UserManagementService:
     def bulk_action(self, db: Session, bulk_request: UserBulkActionRequest) -> UserBulkActionResponse:
         """Perform bulk actions on users"""
         try:
-            success_count = 0
-            failed_count = 0
             failed_users = []
             
+            # Resolve all requested IDs in one query instead of one lookup per user
+            requested_ids = {}
             for user_id in bulk_request.user_ids:
                 try:
-                    user = self.user_repo.get_user_by_id(db, user_id)
-                    if not user:
-                        failed_users.append({"user_id": user_id, "error": "User not found"})
-                        failed_count += 1
-                        continue
-                    
-                    if bulk_request.action == "activate":
-                        user.status = "active"
-                    elif bulk_request.action == "suspend":
-                        user.status = "suspended"
-                    elif bulk_request.action == "ban":
-                        user.status = "banned"
-                    elif bulk_request.action == "delete":
+                    requested_ids[uuid.UUID(user_id)] = user_id
+                except ValueError:
+                    failed_users.append({"user_id": user_id, "error": "User not found"})
+            
+            existing_ids = set(
+                db.execute(select(User.id).where(User.id.in_(list(requested_ids)))).scalars()
+            ) if requested_ids else set()
+            for parsed_id, user_id in requested_ids.items():
+                if parsed_id not in existing_ids:
+                    failed_users.append({"user_id": user_id, "error": "User not found"})
+            
+            if existing_ids:
+                if bulk_request.action == "delete":
+                    # ORM deletes keep the chat/message cascades configured on User
+                    for user in db.execute(select(User).where(User.id.in_(existing_ids))).scalars():
                         db.delete(user)
-                    elif bulk_request.action == "verify_email":
-                        user.is_email_verified = True
-                    elif bulk_request.action == "verify_phone":
-                        user.is_phone_verified = True
-                    
-                    user.updated_at = datetime.utcnow()
-                    success_count += 1
-                    
-                except Exception as e:
-                    failed_users.append({"user_id": user_id, "error": str(e)})
-                    failed_count += 1
+                else:
+                    db.execute(
+                        update(User).where(User.id.in_(existing_ids)).values(
+                            **_BULK_ACTION_VALUES[bulk_request.action],
+                            updated_at=func.now()
+                        ),
+                        execution_options={"synchronize_session": False}
+                    )
+            
+            success_count = len(existing_ids)
+            failed_count = len(failed_users)
             
             db.commit()
+            self.invalidate_user_stats()
             
             return UserBulkActionResponse(
                 success_count=success_count,
@@ -381,40 +441,49 @@ class UserManagementService:
     def get_user_stats(self, db: Session) -> UserStatsResponse:
         """Get comprehensive user statistics"""
         try:
+            cached_stats = self.redis.get_custom_data(USER_STATS_CACHE_KEY)
+            if cached_stats:
+                return UserStatsResponse(**cached_stats)
+            
             now = datetime.utcnow()
-            today = now.date()
+            today_start = datetime.combine(now.date(), dt_time.min)
+            tomorrow_start = today_start + timedelta(days=1)
             week_ago = now - timedelta(days=7)
             month_ago = now - timedelta(days=30)
             
-            # Basic counts
-            total_users = db.query(User).count()
-            active_users = db.query(User).filter(User.status == "active").count()
-            suspended_users = db.query(User).filter(User.status == "suspended").count()
-            banned_users = db.query(User).filter(User.status == "banned").count()
-            pending_verification = db.query(User).filter(User.status == "pending_verification").count()
-            
-            # Verification counts
-            email_verified_users = db.query(User).filter(User.is_email_verified == True).count()
-            phone_verified_users = db.query(User).filter(User.is_phone_verified == True).count()
-            
-            # OAuth and 2FA counts
-            oauth_users = db.query(User).filter(User.oauth_provider.isnot(None)).count()
-            two_factor_enabled_users = db.query(User).filter(User.two_factor_enabled == True).count()
-            
-            # Time-based counts
-            users_created_today = db.query(User).filter(
-                func.date(User.created_at) == today
-            ).count()
-            
-            users_created_this_week = db.query(User).filter(
-                User.created_at >= week_ago
-            ).count()
-            
-            users_created_this_month = db.query(User).filter(
-                User.created_at >= month_ago
-            ).count()
-            
-            return UserStatsResponse(
+            # All counts come from a single aggregate scan over users
+            stats_stmt = lambda_stmt(lambda: select(
+                func.count(User.id),
+                func.count(User.id).filter(User.status == "active"),
+                func.count(User.id).filter(User.status == "suspended"),
+                func.count(User.id).filter(User.status == "banned"),
+                func.count(User.id).filter(User.status == "pending_verification"),
+                func.count(User.id).filter(User.is_email_verified.is_(True)),
+                func.count(User.id).filter(User.is_phone_verified.is_(True)),
+                func.count(User.id).filter(User.oauth_provider.isnot(None)),
+                func.count(User.id).filter(User.two_factor_enabled.is_(True)),
+                func.count(User.id).filter(
+                    and_(User.created_at >= today_start, User.created_at < tomorrow_start)
+                ),
+                func.count(User.id).filter(User.created_at >= week_ago),
+                func.count(User.id).filter(User.created_at >= month_ago),
+            ))
+            (
+                total_users,
+                active_users,
+                suspended_users,
+                banned_users,
+                pending_verification,
+                email_verified_users,
+                phone_verified_users,
+                oauth_users,
+                two_factor_enabled_users,
+                users_created_today,
+                users_created_this_week,
+                users_created_this_month,
+            ) = db.execute(stats_stmt).one()
+            
+            stats = UserStatsResponse(
                 total_users=total_users,
                 active_users=active_users,
                 suspended_users=suspended_users,
@@ -428,6 +497,8 @@ class UserManagementService:
                 users_created_this_week=users_created_this_week,
                 users_created_this_month=users_created_this_month
             )
+            self.redis.cache_custom_data(USER_STATS_CACHE_KEY, stats.model_dump(), expiry=USER_STATS_CACHE_TTL)
+            return stats
             
         except Exception as e:
             logger.error(f"Error getting user stats: {e}")
@@ -450,16 +521,7 @@ class UserManagementService:
         """Get user settings (placeholder for future implementation)"""
         # This would typically fetch from a user_settings table
         # For now, return default settings
-        return {
-            "email_notifications": True,
-            "sms_notifications": False,
-            "two_factor_enabled": False,
-            "session_timeout_hours": 24,
-            "max_concurrent_sessions": 5,
-            "language": "en",
-            "timezone": "UTC",
-            "theme": "light"
-        }
+        return dict(_DEFAULT_SETTINGS)
     
     def update_user_settings(self, db: Session, user_id: str, settings_request: UserSettingsRequest) -> Dict[str, Any]:
         """Update user settings (placeholder for future implementation)"""
@@ -0,0 +1,117 @@
+-- Server-side relevance scoring for RedisService.fuzzy_search.
+-- Mirrors RedisService._calculate_relevance_score; keep the two in sync.
+--
+-- KEYS: syria:qa:<id> record keys to score
+-- ARGV[1]: lowercased, stripped query
+-- ARGV[2]: maximum number of results
+-- ARGV[3]: number of significant query words (n)
+-- ARGV[4 .. 3+n]: significant query words
+-- ARGV[4+n ..]: important keywords, only sent when the query mentions one
+--
+-- Returns the JSON records of the top results, highest score first.
+
+local query = ARGV[1]
+local limit = tonumber(ARGV[2])
+local word_count = tonumber(ARGV[3])
+
+local words = {}
+for i = 1, word_count do
+    words[i] = ARGV[3 + i]
+end
+
+local important = {}
+for i = 4 + word_count, #ARGV do
+    important[#important + 1] = ARGV[i]
+end
+
+local function contains(haystack, needle)
+    return string.find(haystack, needle, 1, true) ~= nil
+end
+
+local function split_lines(text)
+    local items = {}
+    if text == "" then
+        return items
+    end
+    for item in (text .. "\n"):gmatch("(.-)\n") do
+        items[#items + 1] = item
+    end
+    return items
+end
+
+local function score_record(search_blob)
+    local variants_text, keywords_text = search_blob, ""
+    local separator = string.find(search_blob, "\0", 1, true)
+    if separator then
+        variants_text = string.sub(search_blob, 1, separator - 1)
+        keywords_text = string.sub(search_blob, separator + 1)
+    end
+
+    local variants = split_lines(variants_text)
+    local keyword_set = {}
+    for _, keyword in ipairs(split_lines(keywords_text)) do
+        keyword_set[keyword] = true
+    end
+
+    -- Exact question match (highest priority)
+    for _, variant in ipairs(variants) do
+        if variant == query then
+            return 100
+        end
+    end
+
+    local score = 0
+
+    -- Partial question matches
+    for _, variant in ipairs(variants) do
+        if contains(variant, query) or contains(query, variant) then
+            score = score + 50
+        else
+            for _, word in ipairs(words) do
+                if contains(variant, word) then
+                    score = score + 20
+                    break
+                end
+            end
+        end
+    end
+
+    -- Keyword matches
+    for _, word in ipairs(words) do
+        if keyword_set[word] then
+            score = score + 10
+        elseif contains(keywords_text, word) then
+            score = score + 5
+        end
+    end
+
+    -- Bonus for important keywords
+    for _, keyword in ipairs(important) do
+        if keyword_set[keyword] then
+            score = score + 15
+            break
+        end
+    end
+
+    return score
+end
+
+local scored = {}
+for _, key in ipairs(KEYS) do
+    local blob = redis.call("GET", key)
+    if blob then
+        local record = cjson.decode(blob)
+        local score = score_record(record["search_blob"] or "")
+        if score > 0 then
+            scored[#scored + 1] = {score, blob}
+        end
+    end
+end
+
+table.sort(scored, function(a, b) return a[1] > b[1] end)
+
+local results = {}
+for i = 1, math.min(limit, #scored) do
+    results[i] = scored[i][2]
+end
+return results
@@ -1,28 +1,111 @@
+import hashlib
 import json
 import os
 import logging
 import time
 from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
 import redis
 from redis import Redis
-import asyncio
 from pathlib import Path
 from config.logging_config import get_logger, log_function_entry, log_function_exit, log_performance, log_error_with_context
 
+# orjson is optional; fall back to the stdlib json module when it is not installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+
+    def _json_dumps(data: Any) -> str:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(data: Any) -> str:
+        return json.dumps(data, ensure_ascii=False)
+
+# Set of every cached QA id, so searches never have to KEYS-scan the keyspace
+QA_INDEX_KEY = "syria:qa:index"
+# Sets of every cached category name and indexed keyword, maintained at load time
+CATEGORIES_KEY = "syria:categories"
+KEYWORDS_KEY = "syria:keywords"
+# Set per sha1(normalized question variant) of every qa_id asking it, for O(1) exact-question lookup
+VARIANT_KEY_PREFIX = "syria:variant:"
+# Per-file set of "<variant digest> <qa_id>" entries, so a reload can drop the file's old ones
+FILE_VARIANTS_KEY_PREFIX = "syria:file_variants:"
+# Single-id hash the variant sets replaced; deleted on load
+_LEGACY_VARIANT_INDEX_KEY = "syria:variant_index"
+# Stored alongside each file digest; bump when the cached layout changes so unchanged files reload
+CACHE_FORMAT_VERSION = "2"
+# Fields of a syria:category_info:<category> hash, fetched with HMGET
+_CATEGORY_INFO_FIELDS = ("description", "total_items")
+# fuzzy_search result cache: entries live under the current version and expire after the TTL
+FUZZY_VERSION_KEY = "syria:fuzzy:version"
+FUZZY_CACHE_TTL = 300
+# Batch size hint for SCAN when a pattern enumeration cannot be avoided
+SCAN_COUNT = 1000
+# Buffered commands per pipeline round trip when bulk-loading
+PIPELINE_FLUSH_SIZE = 500
+# After a connection failure, is_connected() re-probes with PING at most this often
+HEALTH_PROBE_SECONDS = 5.0
+# Query terms that earn a bonus when the QA pair is also keyed on one of them
+IMPORTANT_KEYWORDS = frozenset({"عاصمة", "capital", "دمشق", "damascus"})
+# Separates the variant and keyword sections of a QA pair's search_blob
+SEARCH_BLOB_SEPARATOR = "\0"
+
+# Server-side version of _calculate_relevance_score, run via EVALSHA
+_FUZZY_SCORE_SCRIPT = (Path(__file__).parent / "fuzzy_search.lua").read_text(encoding="utf-8")
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379")
+
+# Shared by every RedisService instance; creating the pool does not open a connection
+_POOL = redis.ConnectionPool.from_url(
+    REDIS_URL,
+    max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "32")),
+    socket_keepalive=True,
+    decode_responses=True
+)
+
+def _build_search_blob(variants: List[str], keywords: List[str]) -> str:
+    """Lowercased variants and keywords, one per line, in two sections"""
+    return (
+        "\n".join(v.lower().strip() for v in variants)
+        + SEARCH_BLOB_SEPARATOR
+        + "\n".join(k.lower() for k in keywords)
+    )
+
+def _variant_digest(text: str) -> str:
+    """Key of a question variant in the variant index"""
+    return hashlib.sha1(text.lower().strip().encode("utf-8")).hexdigest()
+
+def _public_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip internal scoring fields from a decoded Q&A record"""
+    record.pop("search_blob", None)
+    return record
+
 class RedisService:
     def __init__(self):
         log_function_entry(logger, "__init__")
         start_time = time.time()
         
-        logger.debug("🔧 Initializing RedisService...")
-        default_redis_url = "redis://redis:6379" 
-        self.redis_url = os.getenv("REDIS_URL", default_redis_url)
-        logger.debug(f"🔧 Redis URL: {self.redis_url}")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug("🔧 Initializing RedisService...")
+        self.redis_url = REDIS_URL
         self.client: Optional[Redis] = None
+        self._fuzzy_script = None
+        self._healthy = False
+        self._last_probe = 0.0
         self.syria_data_path = Path(__file__).parent.parent / "data" / "syria_knowledge"
-        logger.debug(f"🔧 Syria data path: {self.syria_data_path}")
+        if debug_enabled:
+            logger.debug(f"🔧 Redis URL: {self.redis_url}")
+            logger.debug(f"🔧 Syria data path: {self.syria_data_path}")
         
         try:
             self._ensure_connection()
@@ -43,12 +126,14 @@ class RedisService:
         
         logger.debug("🔧 Establishing Redis connection...")
         try:
-            self.client = redis.from_url(self.redis_url, decode_responses=True)
+            self.client = Redis(connection_pool=_POOL)
+            self._fuzzy_script = self.client.register_script(_FUZZY_SCORE_SCRIPT)
             logger.debug("✅ Redis client created")
             
             # Test connection
             logger.debug("🔧 Testing Redis connection...")
             self.client.ping()
+            self._healthy = True
             duration = time.time() - start_time
             log_performance(logger, "Redis connection establishment", duration)
             logger.info("✅ Redis connection established successfully")
@@ -63,14 +148,29 @@ class RedisService:
         log_function_exit(logger, "_ensure_connection", duration=time.time() - start_time)
     
     def is_connected(self) -> bool:
-        """Check if Redis is connected"""
-        try:
-            if self.client:
-                self.client.ping()
-                return True
-        except Exception:
+        """Check if Redis is usable without a round trip while it is healthy"""
+        if not self.client:
             return False
-        return False
+        if self._healthy:
+            return True
+        
+        # Unhealthy: let a throttled PING decide when to resume
+        now = time.monotonic()
+        if now - self._last_probe < HEALTH_PROBE_SECONDS:
+            return False
+        self._last_probe = now
+        try:
+            self.client.ping()
+            self._healthy = True
+        except (redis.ConnectionError, redis.TimeoutError):
+            pass
+        return self._healthy
+    
+    def _note_failure(self, error: Exception):
+        """Mark the service unhealthy when a command failed on the connection"""
+        if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+            self._healthy = False
+            self._last_probe = time.monotonic()
     
     def load_syria_knowledge_to_cache(self) -> bool:
         """Load all Syria knowledge JSON files into Redis cache"""
@@ -88,71 +188,124 @@ class RedisService:
                 "Real_post_liberation_events.json"
             ]
             
-            total_cached = 0
-            
+            file_paths = []
             for filename in json_files:
                 file_path = self.syria_data_path / filename
                 if file_path.exists():
-                    cached_count = self._cache_json_file(file_path)
-                    total_cached += cached_count
-                    logger.info(f"Cached {cached_count} items from {filename}")
+                    file_paths.append(file_path)
                 else:
                     logger.warning(f"File not found: {file_path}")
             
+            # Parse and pipeline each file on its own thread; every pipeline
+            # checks out its own connection from the shared pool
+            total_cached = 0
+            if file_paths:
+                with ThreadPoolExecutor(max_workers=len(file_paths)) as executor:
+                    counts = list(executor.map(self.cache_json_file, file_paths))
+                for file_path, cached_count in zip(file_paths, counts):
+                    total_cached += cached_count
+                    logger.info(f"Cached {cached_count} items from {file_path.name}")
+            
             # Cache metadata
-            self.client.set("syria:metadata:total_items", total_cached)
-            self.client.set("syria:metadata:last_updated", str(asyncio.get_event_loop().time()))
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set("syria:metadata:total_items", total_cached)
+            pipe.set("syria:metadata:last_updated", str(time.time()))
+            pipe.delete(_LEGACY_VARIANT_INDEX_KEY)
+            pipe.execute()
             
             logger.info(f"Successfully cached {total_cached} Syria knowledge items")
             return True
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error loading Syria knowledge to cache: {e}")
             return False
     
-    def _cache_json_file(self, file_path: Path) -> int:
-        """Cache a single JSON file's content"""
+    def cache_json_file(self, file_path: Path) -> int:
+        """Cache a single JSON file's Q&A pairs with their keyword, category and variant indexes"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            content = file_path.read_bytes()
+            
+            # Skip files whose content is unchanged since they were last cached
+            digest = f"{CACHE_FORMAT_VERSION}:{hashlib.blake2b(content, digest_size=16).hexdigest()}"
+            file_hash_key = f"syria:file_hash:{file_path.name}"
+            stored_digest, stored_count = self.client.hmget(file_hash_key, ("digest", "cached_count"))
+            if stored_digest == digest:
+                logger.info(f"{file_path.name} unchanged since last load, skipping")
+                return int(stored_count or 0)
+            
+            data = _json_loads(content)
             
             category = data.get("category", file_path.stem)
             qa_pairs = data.get("qa_pairs", [])
             
             cached_count = 0
+            pipe = self.client.pipeline(transaction=False)
+            
+            # Drop the variant entries this file indexed last time before adding the new ones
+            file_variants_key = f"{FILE_VARIANTS_KEY_PREFIX}{file_path.name}"
+            for entry in self.client.smembers(file_variants_key):
+                variant_digest, _, old_qa_id = entry.partition(" ")
+                pipe.srem(f"{VARIANT_KEY_PREFIX}{variant_digest}", old_qa_id)
+            pipe.delete(file_variants_key)
             
             # Cache each Q&A pair
             for qa_pair in qa_pairs:
                 qa_id = qa_pair.get("id")
                 if qa_id:
-                    # Cache the full Q&A pair
-                    self.client.hset(f"syria:qa:{qa_id}", mapping={
-                        "question_variants": json.dumps(qa_pair.get("question_variants", []), ensure_ascii=False),
+                    variants = qa_pair.get("question_variants", [])
+                    keywords = qa_pair.get("keywords", [])
+                    keywords_lower = [keyword.lower() for keyword in keywords]
+                    
+                    # Cache the full Q&A pair as one JSON string, plus a pre-lowercased blob for scoring
+                    record = {
+                        "id": qa_id,
+                        "question_variants": variants,
                         "answer": qa_pair.get("answer", ""),
-                        "keywords": json.dumps(qa_pair.get("keywords", []), ensure_ascii=False),
-                        "confidence": str(qa_pair.get("confidence", 1.0)),
+                        "keywords": keywords,
+                        "confidence": float(qa_pair.get("confidence", 1.0)),
                         "source": qa_pair.get("source", ""),
-                        "category": category
-                    })
+                        "category": category,
+                        "search_blob": _build_search_blob(variants, keywords_lower)
+                    }
+                    pipe.set(f"syria:qa:{qa_id}", _json_dumps(record))
+                    
+                    # Index every variant for exact-question lookup; records sharing a variant all stay listed
+                    for variant_digest in {_variant_digest(variant) for variant in variants}:
+                        pipe.sadd(f"{VARIANT_KEY_PREFIX}{variant_digest}", qa_id)
+                        pipe.sadd(file_variants_key, f"{variant_digest} {qa_id}")
                     
                     # Create keyword indexes for fast searching
-                    for keyword in qa_pair.get("keywords", []):
-                        self.client.sadd(f"syria:keyword:{keyword.lower()}", qa_id)
+                    for keyword in keywords_lower:
+                        pipe.sadd(f"syria:keyword:{keyword}", qa_id)
+                    if keywords_lower:
+                        pipe.sadd(KEYWORDS_KEY, *keywords_lower)
                     
                     # Create category index
-                    self.client.sadd(f"syria:category:{category}", qa_id)
+                    pipe.sadd(f"syria:category:{category}", qa_id)
+                    
+                    # Register in the global QA index
+                    pipe.sadd(QA_INDEX_KEY, qa_id)
                     
                     cached_count += 1
+                    
+                    if len(pipe) >= PIPELINE_FLUSH_SIZE:
+                        pipe.execute()
             
-            # Cache category metadata
-            self.client.hset(f"syria:category_info:{category}", mapping={
+            # Cache category metadata and retire cached fuzzy results
+            pipe.sadd(CATEGORIES_KEY, category)
+            pipe.incr(FUZZY_VERSION_KEY)
+            pipe.hset(f"syria:category_info:{category}", mapping={
                 "description": data.get("description", ""),
                 "total_items": str(len(qa_pairs))
             })
+            pipe.hset(file_hash_key, mapping={"digest": digest, "cached_count": cached_count})
+            pipe.execute()
             
             return cached_count
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error caching file {file_path}: {e}")
             return 0
     
@@ -163,25 +316,14 @@ class RedisService:
         
         try:
             keyword_lower = keyword.lower()
-            qa_ids = self.client.smembers(f"syria:keyword:{keyword_lower}")
-            
-            results = []
-            for qa_id in list(qa_ids)[:limit]:
-                qa_data = self.client.hgetall(f"syria:qa:{qa_id}")
-                if qa_data:
-                    results.append({
-                        "id": qa_id,
-                        "question_variants": json.loads(qa_data.get("question_variants", "[]")),
-                        "answer": qa_data.get("answer", ""),
-                        "keywords": json.loads(qa_data.get("keywords", "[]")),
-                        "confidence": float(qa_data.get("confidence", 1.0)),
-                        "source": qa_data.get("source", ""),
-                        "category": qa_data.get("category", "")
-                    })
+            # SRANDMEMBER with a positive count returns up to `limit` distinct ids
+            # without materializing the whole set
+            qa_ids = self.client.srandmember(f"syria:keyword:{keyword_lower}", limit)
             
-            return results
+            return [_public_record(record) for record in self._fetch_qa_records(qa_ids)]
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error searching by keyword '{keyword}': {e}")
             return []
     
@@ -191,25 +333,12 @@ class RedisService:
             return []
         
         try:
-            qa_ids = self.client.smembers(f"syria:category:{category}")
+            qa_ids = self.client.srandmember(f"syria:category:{category}", limit)
             
-            results = []
-            for qa_id in list(qa_ids)[:limit]:
-                qa_data = self.client.hgetall(f"syria:qa:{qa_id}")
-                if qa_data:
-                    results.append({
-                        "id": qa_id,
-                        "question_variants": json.loads(qa_data.get("question_variants", "[]")),
-                        "answer": qa_data.get("answer", ""),
-                        "keywords": json.loads(qa_data.get("keywords", "[]")),
-                        "confidence": float(qa_data.get("confidence", 1.0)),
-                        "source": qa_data.get("source", ""),
-                        "category": qa_data.get("category", "")
-                    })
-            
-            return results
+            return [_public_record(record) for record in self._fetch_qa_records(qa_ids)]
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error searching by category '{category}': {e}")
             return []
     
@@ -219,20 +348,13 @@ class RedisService:
             return None
         
         try:
-            qa_data = self.client.hgetall(f"syria:qa:{qa_id}")
-            if qa_data:
-                return {
-                    "id": qa_id,
-                    "question_variants": json.loads(qa_data.get("question_variants", "[]")),
-                    "answer": qa_data.get("answer", ""),
-                    "keywords": json.loads(qa_data.get("keywords", "[]")),
-                    "confidence": float(qa_data.get("confidence", 1.0)),
-                    "source": qa_data.get("source", ""),
-                    "category": qa_data.get("category", "")
-                }
+            blob = self.client.get(f"syria:qa:{qa_id}")
+            if blob:
+                return _public_record(_json_loads(blob))
             return None
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error getting Q&A by ID '{qa_id}': {e}")
             return None
     
@@ -242,12 +364,10 @@ class RedisService:
             return []
         
         try:
-            pattern = "syria:category_info:*"
-            keys = self.client.keys(pattern)
-            categories = [key.replace("syria:category_info:", "") for key in keys]
-            return categories
+            return list(self.client.smembers(CATEGORIES_KEY))
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error getting categories: {e}")
             return []
     
@@ -257,16 +377,19 @@ class RedisService:
             return None
         
         try:
-            info = self.client.hgetall(f"syria:category_info:{category}")
-            if info:
+            description, total_items = self.client.hmget(
+                f"syria:category_info:{category}", _CATEGORY_INFO_FIELDS
+            )
+            if description is not None or total_items is not None:
                 return {
                     "category": category,
-                    "description": info.get("description", ""),
-                    "total_items": int(info.get("total_items", 0))
+                    "description": description or "",
+                    "total_items": int(total_items or 0)
                 }
             return None
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error getting category info for '{category}': {e}")
             return None
     
@@ -277,57 +400,98 @@ class RedisService:
         
         try:
             query_lower = query.lower().strip()
-            query_words = query_lower.split()
-            all_results = []
-            
-            # First, try to find exact question matches
-            exact_question_matches = self._search_exact_question_matches(query_lower)
-            if exact_question_matches:
-                # If we find exact matches, return them with high confidence
-                return exact_question_matches[:limit]
-            
-            # If no exact matches, perform semantic search with relevance scoring
-            scored_results = []
-            
-            # Get all Q&A pairs
-            all_qa_keys = self.client.keys("syria:qa:*")
-            
-            for qa_key in all_qa_keys:
-                qa_id = qa_key.replace("syria:qa:", "")
-                qa_data = self.client.hgetall(qa_key)
-                
-                if qa_data:
-                    # Calculate relevance score
-                    relevance_score = self._calculate_relevance_score(
-                        query_lower, query_words, qa_data
-                    )
-                    
-                    if relevance_score > 0:  # Only include relevant results
-                        result = {
-                            "id": qa_id,
-                            "question_variants": json.loads(qa_data.get("question_variants", "[]")),
-                            "answer": qa_data.get("answer", ""),
-                            "keywords": json.loads(qa_data.get("keywords", "[]")),
-                            "confidence": float(qa_data.get("confidence", 1.0)),
-                            "source": qa_data.get("source", ""),
-                            "category": qa_data.get("category", ""),
-                            "relevance_score": relevance_score
-                        }
-                        scored_results.append(result)
-            
-            # Sort by relevance score (highest first) and return top results
-            scored_results.sort(key=lambda x: x["relevance_score"], reverse=True)
-            
-            # Remove relevance_score from final results
-            for result in scored_results[:limit]:
-                result.pop("relevance_score", None)
-            
-            return scored_results[:limit]
+            
+            # Repeat queries are served from the result cache; loading data bumps
+            # the version so stale entries are never read again
+            version = self.client.get(FUZZY_VERSION_KEY) or "0"
+            query_digest = hashlib.blake2b(query_lower.encode("utf-8"), digest_size=10).hexdigest()
+            cache_key = f"syria:fuzzy:{version}:{query_digest}:{limit}"
+            cached = self.client.get(cache_key)
+            if cached is not None:
+                return _json_loads(cached)
+            
+            results = self._rank_fuzzy_matches(query_lower, limit)
+            self.client.setex(cache_key, FUZZY_CACHE_TTL, _json_dumps(results))
+            return results
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error in fuzzy search for '{query}': {e}")
             return []
     
+    def _rank_fuzzy_matches(self, query_lower: str, limit: int) -> List[Dict[str, Any]]:
+        """Exact-question lookup, falling back to relevance-scored keyword candidates"""
+        query_words = query_lower.split()
+        
+        # First, try to find exact question matches
+        exact_question_matches = self._search_exact_question_matches(query_lower)
+        if exact_question_matches:
+            # If we find exact matches, return them with high confidence
+            return exact_question_matches[:limit]
+        
+        # If no exact matches, perform semantic search with relevance scoring
+        scored_results = []
+        
+        # Per-query scoring inputs, computed once rather than per candidate
+        significant_words = [word for word in query_words if len(word) > 2]
+        query_is_important = any(keyword in query_lower for keyword in IMPORTANT_KEYWORDS)
+        
+        # Recall candidates from the keyword inverted index and only score those;
+        # fall back to the full index when no query word is an indexed keyword
+        candidate_ids = self._keyword_candidates(query_words)
+        if not candidate_ids:
+            candidate_ids = self.client.smembers(QA_INDEX_KEY)
+        
+        # Score inside Redis so candidate records never cross the network;
+        # fall back to scoring in Python if the server rejects the script
+        try:
+            blobs = self._fuzzy_script(
+                keys=[f"syria:qa:{qa_id}" for qa_id in candidate_ids],
+                args=[
+                    query_lower, limit, len(significant_words), *significant_words,
+                    *(IMPORTANT_KEYWORDS if query_is_important else ())
+                ]
+            )
+            return [_public_record(_json_loads(blob)) for blob in blobs]
+        except redis.ResponseError as e:
+            logger.warning(f"Fuzzy scoring script failed, scoring in Python: {e}")
+        
+        for record in self._fetch_qa_records(candidate_ids):
+            # Calculate relevance score
+            relevance_score = self._calculate_relevance_score(
+                query_lower, significant_words, query_is_important, record
+            )
+            
+            if relevance_score > 0:  # Only include relevant results
+                result = _public_record(record)
+                result["relevance_score"] = relevance_score
+                scored_results.append(result)
+        
+        # Sort by relevance score (highest first) and return top results
+        scored_results.sort(key=lambda x: x["relevance_score"], reverse=True)
+        
+        # Remove relevance_score from final results
+        for result in scored_results[:limit]:
+            result.pop("relevance_score", None)
+        
+        return scored_results[:limit]
+    
+    def _keyword_candidates(self, query_words: List[str]) -> set:
+        """Union of the keyword index sets for the query's significant words"""
+        keyword_keys = [f"syria:keyword:{word}" for word in query_words if len(word) > 2]
+        if not keyword_keys:
+            return set()
+        return self.client.sunion(keyword_keys)
+    
+    def _fetch_qa_records(self, qa_ids) -> List[Dict[str, Any]]:
+        """Fetch and decode Q&A records for the given ids with a single MGET"""
+        qa_ids = list(qa_ids)
+        if not qa_ids:
+            return []
+        
+        blobs = self.client.mget([f"syria:qa:{qa_id}" for qa_id in qa_ids])
+        return [_json_loads(blob) for blob in blobs if blob]
+    
     def _search_exact_question_matches(self, query: str) -> List[Dict[str, Any]]:
         """Search for exact question matches in question variants"""
         if not self.is_connected():
@@ -335,72 +499,57 @@ class RedisService:
         
         try:
             exact_matches = []
-            all_qa_keys = self.client.keys("syria:qa:*")
-            
-            for qa_key in all_qa_keys:
-                qa_id = qa_key.replace("syria:qa:", "")
-                qa_data = self.client.hgetall(qa_key)
-                
-                if qa_data:
-                    question_variants = json.loads(qa_data.get("question_variants", "[]"))
-                    
-                    # Check for exact matches in question variants
-                    for variant in question_variants:
-                        if query == variant.lower().strip():
-                            result = {
-                                "id": qa_id,
-                                "question_variants": question_variants,
-                                "answer": qa_data.get("answer", ""),
-                                "keywords": json.loads(qa_data.get("keywords", "[]")),
-                                "confidence": float(qa_data.get("confidence", 1.0)),
-                                "source": qa_data.get("source", ""),
-                                "category": qa_data.get("category", "")
-                            }
-                            exact_matches.append(result)
-                            break
+            
+            # One SMEMBERS on the variant's set replaces scanning every record's variants
+            qa_ids = self.client.smembers(f"{VARIANT_KEY_PREFIX}{_variant_digest(query)}")
+            for record in self._fetch_qa_records(sorted(qa_ids)):
+                exact_matches.append(_public_record(record))
             
             return exact_matches
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error in exact question search: {e}")
             return []
     
-    def _calculate_relevance_score(self, query: str, query_words: List[str], qa_data: Dict[str, str]) -> float:
-        """Calculate relevance score for a Q&A pair based on the query"""
+    def _calculate_relevance_score(self, query: str, significant_words: List[str],
+                                   query_is_important: bool, qa_data: Dict[str, Any]) -> float:
+        """Calculate relevance score for a Q&A pair based on the query (mirrors fuzzy_search.lua)"""
         try:
             score = 0.0
             
-            # Get question variants and keywords
-            question_variants = json.loads(qa_data.get("question_variants", "[]"))
-            keywords = json.loads(qa_data.get("keywords", "[]"))
+            search_blob = qa_data.get("search_blob")
+            if search_blob is None:
+                # Entry cached before search_blob existed
+                search_blob = _build_search_blob(
+                    qa_data.get("question_variants", []), qa_data.get("keywords", [])
+                )
+            variants_text, _, keywords_text = search_blob.partition(SEARCH_BLOB_SEPARATOR)
+            variants_lower = variants_text.split("\n") if variants_text else []
+            keyword_set = frozenset(keywords_text.split("\n")) if keywords_text else frozenset()
             
             # Check for exact question match (highest priority)
-            for variant in question_variants:
-                if query == variant.lower().strip():
-                    return 100.0  # Maximum score for exact match
+            if query in variants_lower:
+                return 100.0  # Maximum score for exact match
             
             # Check for partial question matches
-            for variant in question_variants:
-                variant_lower = variant.lower()
+            for variant_lower in variants_lower:
                 if query in variant_lower or variant_lower in query:
                     score += 50.0
-                elif any(word in variant_lower for word in query_words if len(word) > 2):
+                elif any(word in variant_lower for word in significant_words):
                     score += 20.0
             
-            # Check keyword matches
-            keywords_lower = [kw.lower() for kw in keywords]
-            for word in query_words:
-                if len(word) > 2:  # Only consider words longer than 2 characters
-                    if word in keywords_lower:
-                        score += 10.0
-                    elif any(word in kw for kw in keywords_lower):
-                        score += 5.0
+            # Check keyword matches; a substring hit on the newline-joined
+            # keywords is a hit on some keyword since words never contain newlines
+            for word in significant_words:
+                if word in keyword_set:
+                    score += 10.0
+                elif word in keywords_text:
+                    score += 5.0
             
             # Bonus for important keywords like "عاصمة" (capital)
-            important_keywords = ["عاصمة", "capital", "دمشق", "damascus"]
-            if any(keyword in query for keyword in important_keywords):
-                if any(keyword in keywords_lower for keyword in important_keywords):
-                    score += 15.0
+            if query_is_important and not keyword_set.isdisjoint(IMPORTANT_KEYWORDS):
+                score += 15.0
             
             return score
             
@@ -414,11 +563,12 @@ class RedisService:
             return False
         
         try:
-            serialized_data = json.dumps(data, ensure_ascii=False)
+            serialized_data = _json_dumps(data)
             self.client.setex(f"syria:custom:{key}", expiry, serialized_data)
             return True
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error caching custom data '{key}': {e}")
             return False
     
@@ -430,26 +580,44 @@ class RedisService:
         try:
             data = self.client.get(f"syria:custom:{key}")
             if data:
-                return json.loads(data)
+                return _json_loads(data)
             return None
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error getting custom data '{key}': {e}")
             return None
     
+    def delete_custom_data(self, key: str) -> bool:
+        """Remove custom cached data"""
+        if not self.is_connected():
+            return False
+        
+        try:
+            self.client.delete(f"syria:custom:{key}")
+            return True
+            
+        except Exception as e:
+            self._note_failure(e)
+            logger.error(f"Error deleting custom data '{key}': {e}")
+            return False
+    
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get Redis cache statistics"""
         if not self.is_connected():
             return {"connected": False}
         
         try:
-            total_items = self.client.get("syria:metadata:total_items") or "0"
-            last_updated = self.client.get("syria:metadata:last_updated") or "Never"
-            
-            # Count different types of keys
-            qa_keys = len(self.client.keys("syria:qa:*"))
-            keyword_keys = len(self.client.keys("syria:keyword:*"))
-            category_keys = len(self.client.keys("syria:category:*"))
+            # Counts come from the index sets maintained at load time, not KEYS
+            pipe = self.client.pipeline(transaction=False)
+            pipe.get("syria:metadata:total_items")
+            pipe.get("syria:metadata:last_updated")
+            pipe.scard(QA_INDEX_KEY)
+            pipe.scard(KEYWORDS_KEY)
+            pipe.scard(CATEGORIES_KEY)
+            total_items, last_updated, qa_keys, keyword_keys, category_keys = pipe.execute()
+            total_items = total_items or "0"
+            last_updated = last_updated or "Never"
             
             return {
                 "connected": True,
@@ -462,6 +630,7 @@ class RedisService:
             }
             
         except Exception as e:
+            self._note_failure(e)
             logger.error(f"Error getting cache stats: {e}")
             return {"connected": False, "error": str(e)}
 
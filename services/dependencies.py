@@ -10,11 +10,11 @@ import logging
 import time
 
 from services.auth import get_auth_service, oauth2_scheme
+from services.repositories import user_repository
 from services.database.database import get_db
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
-# Removed direct import - using get_user_repository() function instead
 
 limiter = Limiter(key_func=get_remote_address)
 
@@ -44,11 +44,8 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         logger.error(f"JWT token validation error: {e}")
         raise credentials_exception
     
-    logger.debug("Getting user repository")
-    from services.repositories import get_user_repository
-    user_repo = get_user_repository()
     logger.debug(f"Looking up user by email: {email}")
-    user = user_repo.get_user_by_email(db, email)
+    user = user_repository.get_user_by_email(db, email)
     
     if user is None:
         logger.error(f"User not found in database for email: {email}")
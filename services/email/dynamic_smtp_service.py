@@ -1,24 +1,95 @@
 import os
 import re
+import asyncio
+import functools
+from collections import defaultdict
 import aiosmtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any, Optional, Tuple
+from email import policy
+from email.message import EmailMessage
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple, Callable, Awaitable
 import logging
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 
 from config.config_loader import config_loader
-from config.logging_config import (
-    get_logger,
-    log_function_entry,
-    log_function_exit,
-    log_performance,
-    log_error_with_context
-)
+
+# aiodns is optional; without it domains outside the static map resolve to 'custom'
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
+from config.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Warm connections kept per SMTP account, and messages sent on one before it is rotated
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "5"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+# Idle connections older than this are checked with NOOP before reuse
+SMTP_IDLE_CHECK_SECONDS = 60.0
+# Handshakes allowed in flight to one SMTP host, to stay under provider connection limits
+SMTP_MAX_CONCURRENT_HANDSHAKES = int(os.getenv("SMTP_MAX_CONCURRENT_HANDSHAKES", "4"))
+
+# Batches at least this large stop once a third of their messages have failed
+BATCH_ABORT_MIN_SIZE = 30
+
+# Read-only so the shared map can be handed to callers without copying
+_DOMAIN_PROVIDER_MAP: Mapping[str, str] = MappingProxyType({
+    'gmail.com': 'gmail',
+    'googlemail.com': 'gmail',
+    'hotmail.com': 'hotmail',
+    'outlook.com': 'outlook',
+    'live.com': 'outlook',
+    'msn.com': 'outlook',
+    'yahoo.com': 'yahoo',
+    'ymail.com': 'yahoo',
+    'rocketmail.com': 'yahoo',
+    'protonmail.com': 'protonmail',
+    'proton.me': 'protonmail',
+    'icloud.com': 'icloud',
+    'me.com': 'icloud',
+    'mac.com': 'icloud',
+    'zoho.com': 'zoho'
+})
+
+# MX host suffixes of the hosted providers, for custom domains (e.g. Google Workspace)
+_MX_PROVIDER_SUFFIXES: Tuple[Tuple[str, str], ...] = (
+    ('.google.com', 'gmail'),
+    ('.googlemail.com', 'gmail'),
+    ('.outlook.com', 'outlook'),
+    ('.yahoodns.net', 'yahoo'),
+    ('.protonmail.ch', 'protonmail'),
+    ('.icloud.com', 'icloud'),
+    ('.zoho.com', 'zoho'),
+    ('.zoho.eu', 'zoho'),
+)
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_provider_settings(provider: str) -> Tuple[str, int, bool, bool, bool]:
+    """(host, port, use_tls, use_ssl, requires_auth) for a provider; credentials are added per call"""
+    provider_config = config_loader.get_smtp_provider_config(provider)
+    
+    if not provider_config:
+        raise ValueError(f"Unknown SMTP provider: {provider}")
+    
+    # For Gmail, prefer TLS (port 587) over SSL (port 465) for better compatibility
+    if provider == 'gmail':
+        port = provider_config.get('smtp_port', 587)  # Use TLS port by default
+        use_ssl = False
+        use_tls = True
+    else:
+        # Use SSL port if specified, otherwise use regular port
+        port = provider_config.get('smtp_port_ssl', provider_config.get('smtp_port', 587))
+        use_ssl = provider_config.get('use_ssl', False)
+        use_tls = provider_config.get('use_tls', True) if not use_ssl else False
+    
+    return (provider_config['smtp_host'], port, use_tls, use_ssl,
+            provider_config.get('requires_auth', True))
+
 
 @dataclass
 class SMTPConfig:
@@ -32,47 +103,161 @@ class SMTPConfig:
     requires_auth: bool = True
 
 
+@dataclass
+class OutgoingEmail:
+    """A single message to deliver"""
+    to_email: str
+    subject: str
+    html_content: str
+    text_content: Optional[str] = None
+
+
+async def _close_client(client: aiosmtplib.SMTP) -> None:
+    """QUIT politely, falling back to dropping the socket"""
+    try:
+        await client.quit()
+    except Exception:
+        client.close()
+
+
+@dataclass
+class PooledSMTP:
+    """An authenticated SMTP connection, the messages sent on it and when it was last used"""
+    client: aiosmtplib.SMTP
+    message_count: int = 0
+    last_used_ts: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class SMTPConnectionPool:
+    """Bounded pool of authenticated connections for one SMTP account"""
+    smtp_config: SMTPConfig
+    connect: Callable[[SMTPConfig], Awaitable[aiosmtplib.SMTP]]
+    pool_size: int = SMTP_POOL_SIZE
+    max_messages: int = SMTP_MAX_MESSAGES_PER_CONNECTION
+    _idle: asyncio.Queue = field(default_factory=asyncio.Queue, init=False)
+    _slots: asyncio.Semaphore = field(init=False)
+
+    def __post_init__(self):
+        self._slots = asyncio.Semaphore(self.pool_size)
+
+    async def acquire(self) -> PooledSMTP:
+        """Check out an idle connection, opening a new one while under pool_size"""
+        await self._slots.acquire()
+        try:
+            while not self._idle.empty():
+                entry = self._idle.get_nowait()
+                if not entry.client.is_connected:
+                    continue
+                if time.monotonic() - entry.last_used_ts > SMTP_IDLE_CHECK_SECONDS:
+                    # The server may have timed out a long-idle connection
+                    try:
+                        await entry.client.noop()
+                    except Exception:
+                        await self.recycle(entry)
+                return entry
+            return PooledSMTP(await self.connect(self.smtp_config))
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, entry: PooledSMTP, healthy: bool) -> None:
+        """Return a connection, or close it if it failed or reached max_messages"""
+        try:
+            if healthy and entry.client.is_connected and entry.message_count < self.max_messages:
+                entry.last_used_ts = time.monotonic()
+                self._idle.put_nowait(entry)
+            else:
+                await _close_client(entry.client)
+        finally:
+            self._slots.release()
+
+    async def recycle(self, entry: PooledSMTP) -> None:
+        """Replace a checked-out entry's connection with a fresh one"""
+        await _close_client(entry.client)
+        entry.client = await self.connect(self.smtp_config)
+        entry.message_count = 0
+
+    def adopt(self, client: aiosmtplib.SMTP) -> None:
+        """Add an already-open connection to the idle set"""
+        if self._idle.qsize() < self.pool_size:
+            self._idle.put_nowait(PooledSMTP(client))
+        else:
+            client.close()
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            await _close_client(self._idle.get_nowait().client)
+
+
 class DynamicSMTPService:
     """Dynamic SMTP service that automatically configures based on email provider"""
     
+    # Domain to provider mapping, shared by all instances
+    domain_provider_map: Mapping[str, str] = _DOMAIN_PROVIDER_MAP
+
     def __init__(self):
         self.email_from = os.getenv("EMAIL_FROM", "noreply@syriagpt.com")
         self.email_from_name = os.getenv("EMAIL_FROM_NAME", "Syria GPT")
         self.frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
         self.backend_url = os.getenv("BACKEND_URL", "http://localhost:9000")
+        self.refresh_env()
         
-        # Domain to provider mapping
-        self.domain_provider_map = {
-            'gmail.com': 'gmail',
-            'googlemail.com': 'gmail',
-            'hotmail.com': 'hotmail',
-            'outlook.com': 'outlook',
-            'live.com': 'outlook',
-            'msn.com': 'outlook',
-            'yahoo.com': 'yahoo',
-            'ymail.com': 'yahoo',
-            'rocketmail.com': 'yahoo',
-            'protonmail.com': 'protonmail',
-            'proton.me': 'protonmail',
-            'icloud.com': 'icloud',
-            'me.com': 'icloud',
-            'mac.com': 'icloud',
-            'zoho.com': 'zoho'
-        }
+        # Connection pools reused across sends, one per (host, port, username, use_tls, use_ssl)
+        self._pools: Dict[tuple, SMTPConnectionPool] = {}
+        # Port that answered the first probe, per provider, for the life of the process
+        self._preferred_port: Dict[str, int] = {}
+        # Provider found from MX records, per custom domain, for the life of the process
+        self._mx_cache: Dict[str, str] = {}
+        self._resolver = None
+        # Bounds concurrent connect/login per host; sends on open connections are not limited
+        self._mx_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(SMTP_MAX_CONCURRENT_HANDSHAKES)
+        )
+
+    def refresh_env(self) -> None:
+        """Re-read the default SMTP credentials and ENV, which are otherwise read once"""
+        self._default_smtp_user = os.getenv("SMTP_USER")
+        self._default_smtp_password = os.getenv("SMTP_PASSWORD")
+        self._env = os.getenv("ENV")
 
     def detect_provider_from_email(self, email: str) -> str:
         """Detect email provider from email address domain"""
-        domain = email.lower().split('@')[-1]
-        
-        # Check domain mapping first
-        if domain in self.domain_provider_map:
-            return self.domain_provider_map[domain]
-        
-        # Check if it's a custom domain by looking at SMTP providers
-        providers = config_loader.get_all_smtp_providers()
+        domain = email.rpartition('@')[2].lower()
         
         # For custom domains, we'll use the 'custom' provider
         # but the user needs to configure the SMTP settings manually
+        return self.domain_provider_map.get(domain) or self._mx_cache.get(domain, 'custom')
+
+    async def resolve_provider(self, email: str) -> str:
+        """Detect email provider, looking up MX records for domains not in the static map"""
+        domain = email.rpartition('@')[2].lower()
+        provider = self.domain_provider_map.get(domain) or self._mx_cache.get(domain)
+        if provider is None:
+            provider = await self._detect_provider_by_mx(domain)
+            if provider is None:
+                return 'custom'
+            self._mx_cache[domain] = provider
+        return provider
+
+    async def _detect_provider_by_mx(self, domain: str) -> Optional[str]:
+        """Provider whose servers handle the domain's mail; None if the lookup failed"""
+        if aiodns is None:
+            return 'custom'
+        try:
+            if self._resolver is None:
+                self._resolver = aiodns.DNSResolver()
+            records = await self._resolver.query(domain, 'MX')
+        except Exception as e:
+            # Not cached, so a transient DNS failure is retried on the next send
+            logger.warning(f"MX lookup for {domain} failed: {e}")
+            return None
+        
+        for record in sorted(records, key=lambda r: r.priority):
+            host = record.host.rstrip('.').lower()
+            for suffix, provider in _MX_PROVIDER_SUFFIXES:
+                if host.endswith(suffix):
+                    return provider
         return 'custom'
 
     def get_smtp_config(self, email: str, password: str, provider: Optional[str] = None) -> SMTPConfig:
@@ -81,30 +266,16 @@ class DynamicSMTPService:
         if not provider:
             provider = self.detect_provider_from_email(email)
         
-        provider_config = config_loader.get_smtp_provider_config(provider)
-        
-        if not provider_config:
-            raise ValueError(f"Unknown SMTP provider: {provider}")
-        
-        # For Gmail, prefer TLS (port 587) over SSL (port 465) for better compatibility
-        if provider == 'gmail':
-            port = provider_config.get('smtp_port', 587)  # Use TLS port by default
-            use_ssl = False
-            use_tls = True
-        else:
-            # Use SSL port if specified, otherwise use regular port
-            port = provider_config.get('smtp_port_ssl', provider_config.get('smtp_port', 587))
-            use_ssl = provider_config.get('use_ssl', False)
-            use_tls = provider_config.get('use_tls', True) if not use_ssl else False
+        host, port, use_tls, use_ssl, requires_auth = _resolve_provider_settings(provider)
         
         return SMTPConfig(
-            host=provider_config['smtp_host'],
+            host=host,
             port=port,
             username=email,
             password=password,
             use_tls=use_tls,
             use_ssl=use_ssl,
-            requires_auth=provider_config.get('requires_auth', True)
+            requires_auth=requires_auth
         )
 
     async def test_smtp_connection(self, email: str, password: str, provider: Optional[str] = None) -> Tuple[bool, str]:
@@ -112,25 +283,17 @@ class DynamicSMTPService:
         try:
             smtp_config = self.get_smtp_config(email, password, provider)
             
-            # Create a test message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = "SMTP Test - Syria GPT"
-            message["From"] = f"{self.email_from_name} <{email}>"
-            message["To"] = email
-            
-            text_part = MIMEText("This is a test email to verify SMTP configuration.", "plain")
-            message.attach(text_part)
-            
-            # Send test email
-            await aiosmtplib.send(
-                message,
-                hostname=smtp_config.host,
-                port=smtp_config.port,
-                start_tls=smtp_config.use_tls,
-                use_tls=smtp_config.use_ssl,
-                username=smtp_config.username if smtp_config.requires_auth else None,
-                password=smtp_config.password if smtp_config.requires_auth else None,
-            )
+            # EHLO + AUTH is enough to verify the credentials; no message is sent
+            async with self._mx_semaphores[smtp_config.host]:
+                async with aiosmtplib.SMTP(
+                    hostname=smtp_config.host,
+                    port=smtp_config.port,
+                    use_tls=smtp_config.use_ssl,
+                    start_tls=smtp_config.use_tls,
+                    timeout=30
+                ) as client:
+                    if smtp_config.requires_auth:
+                        await client.login(smtp_config.username, smtp_config.password)
             
             return True, "SMTP connection test successful"
             
@@ -149,95 +312,211 @@ class DynamicSMTPService:
         from_password: Optional[str] = None,
         provider: Optional[str] = None
     ) -> Tuple[bool, Optional[str]]:
-        """Send email using dynamic SMTP configuration with retry logic"""
+        """Send email using dynamic SMTP configuration"""
+        results = await self.send_many(
+            [OutgoingEmail(to_email, subject, html_content, text_content)],
+            from_email=from_email,
+            from_password=from_password,
+            provider=provider
+        )
+        return results[0]
+
+    async def send_many(
+        self,
+        emails: List[OutgoingEmail],
+        from_email: Optional[str] = None,
+        from_password: Optional[str] = None,
+        provider: Optional[str] = None
+    ) -> List[Tuple[bool, Optional[str]]]:
+        """Send several emails from one account over a single pooled connection.
+
+        A large batch that keeps failing is cut short, so the result list can
+        be shorter than ``emails``; the emails past its end were not attempted.
+        """
+        if not emails:
+            return []
         
         # Use environment variables if not provided
         if not from_email:
-            from_email = os.getenv("SMTP_USER")
+            from_email = self._default_smtp_user
         if not from_password:
-            from_password = os.getenv("SMTP_PASSWORD")
+            from_password = self._default_smtp_password
         
         if not from_email or not from_password:
             # Fallback to development mode
-            if os.getenv("ENV") == "development":
-                logger.info(f"DEVELOPMENT MODE: Email would be sent to {to_email}")
-                logger.info(f"Subject: {subject}")
-                logger.info(f"Content: {text_content or html_content[:200]}...")
-                return True, None
+            if self._env == "development":
+                for email in emails:
+                    logger.info(f"DEVELOPMENT MODE: Email would be sent to {email.to_email}")
+                    logger.info(f"Subject: {email.subject}")
+                    logger.info(f"Content: {email.text_content or email.html_content[:200]}...")
+                return [(True, None)] * len(emails)
             else:
-                return False, "SMTP credentials not configured"
+                return [(False, "SMTP credentials not configured")] * len(emails)
         
-        # Try different SMTP configurations for Gmail
         if not provider:
-            provider = self.detect_provider_from_email(from_email)
+            provider = await self.resolve_provider(from_email)
         
-        configs_to_try = []
+        messages = [self._build_message(email, from_email) for email in emails]
         
-        if provider == 'gmail':
-            # Try TLS first (port 587), then SSL (port 465) as fallback
-            configs_to_try = [
-                {'port': 587, 'use_tls': True, 'use_ssl': False},
-                {'port': 465, 'use_tls': False, 'use_ssl': True}
-            ]
-        else:
-            # Use default configuration for other providers
-            smtp_config = self.get_smtp_config(from_email, from_password, provider)
-            configs_to_try = [{
-                'port': smtp_config.port,
-                'use_tls': smtp_config.use_tls,
-                'use_ssl': smtp_config.use_ssl
-            }]
+        try:
+            smtp_config = await self._select_config(
+                provider, self.get_smtp_config(from_email, from_password, provider)
+            )
+            errors = await self._send_batch(smtp_config, messages)
+        except Exception as e:
+            # Nothing was sent; re-probe the port on the next send
+            self._preferred_port.pop(provider, None)
+            results = []
+            for email in emails:
+                error_msg = f"Failed to send email to {email.to_email}: {str(e)}"
+                logger.error(error_msg)
+                results.append((False, error_msg))
+            return results
+        
+        results = []
+        for email, error in zip(emails, errors):
+            if error is None:
+                logger.info(f"Email sent successfully to {email.to_email} using {smtp_config.host}:{smtp_config.port}")
+                results.append((True, None))
+            else:
+                error_msg = f"Failed to send email to {email.to_email} using {smtp_config.host}:{smtp_config.port}: {str(error)}"
+                logger.error(error_msg)
+                results.append((False, error_msg))
+        return results
+
+    async def _select_config(self, provider: str, base_config: SMTPConfig) -> SMTPConfig:
+        """Pick the port for providers that accept both STARTTLS (587) and SSL (465)"""
+        if provider != 'gmail':
+            return base_config
         
+        candidates = [
+            replace(base_config, port=587, use_tls=True, use_ssl=False),
+            replace(base_config, port=465, use_tls=False, use_ssl=True)
+        ]
+        preferred = self._preferred_port.get(provider)
+        for smtp_config in candidates:
+            if smtp_config.port == preferred:
+                return smtp_config
+        
+        # First send for this provider: probe both ports at once rather than
+        # waiting out a full timeout on one before trying the other
+        clients = await asyncio.gather(
+            *(self._open_client(smtp_config) for smtp_config in candidates),
+            return_exceptions=True
+        )
+        winner = None
         last_error = None
+        for smtp_config, client in zip(candidates, clients):
+            if isinstance(client, BaseException):
+                last_error = client
+                logger.warning(f"SMTP probe of {smtp_config.host}:{smtp_config.port} (TLS:{smtp_config.use_tls}, SSL:{smtp_config.use_ssl}) failed: {str(client)}")
+            elif winner is None:
+                # Keep the winning connection warm for the send that follows
+                winner = smtp_config
+                self._get_pool(smtp_config).adopt(client)
+            else:
+                await _close_client(client)
         
-        for config in configs_to_try:
-            try:
-                # Get base SMTP configuration
-                smtp_config = self.get_smtp_config(from_email, from_password, provider)
-                
-                # Override with current config
-                smtp_config.port = config['port']
-                smtp_config.use_tls = config['use_tls']
-                smtp_config.use_ssl = config['use_ssl']
-                
-                # Create message
-                message = MIMEMultipart("alternative")
-                message["Subject"] = subject
-                message["From"] = f"{self.email_from_name} <{from_email}>"
-                message["To"] = to_email
-                
-                if text_content:
-                    text_part = MIMEText(text_content, "plain")
-                    message.attach(text_part)
-                
-                html_part = MIMEText(html_content, "html")
-                message.attach(html_part)
-                
-                # Send email
-                await aiosmtplib.send(
-                    message,
-                    hostname=smtp_config.host,
-                    port=smtp_config.port,
-                    start_tls=smtp_config.use_tls,
-                    use_tls=smtp_config.use_ssl,
-                    username=smtp_config.username if smtp_config.requires_auth else None,
-                    password=smtp_config.password if smtp_config.requires_auth else None,
-                    timeout=30  # Add timeout to prevent hanging
-                )
-                
-                logger.info(f"Email sent successfully to {to_email} using {smtp_config.host}:{smtp_config.port}")
-                return True, None
-                
-            except Exception as e:
-                last_error = e
-                error_msg = f"Failed to send email using {smtp_config.host}:{smtp_config.port} (TLS:{smtp_config.use_tls}, SSL:{smtp_config.use_ssl}): {str(e)}"
-                logger.warning(error_msg)
-                continue
+        if winner is None:
+            raise last_error
+        self._preferred_port[provider] = winner.port
+        return winner
+
+    def _build_message(self, email: OutgoingEmail, from_email: str) -> EmailMessage:
+        message = EmailMessage(policy=policy.SMTP)
+        message["Subject"] = email.subject
+        message["From"] = f"{self.email_from_name} <{from_email}>"
+        message["To"] = email.to_email
         
-        # If all configurations failed
-        final_error_msg = f"Failed to send email to {to_email} after trying all configurations. Last error: {str(last_error)}"
-        logger.error(final_error_msg)
-        return False, final_error_msg
+        # multipart/alternative with a plain-text part when we have one
+        if email.text_content:
+            message.set_content(email.text_content)
+            message.add_alternative(email.html_content, subtype="html")
+        else:
+            message.set_content(email.html_content, subtype="html")
+        return message
+
+    @staticmethod
+    def _client_key(smtp_config: SMTPConfig) -> tuple:
+        return (smtp_config.host, smtp_config.port, smtp_config.username,
+                smtp_config.use_tls, smtp_config.use_ssl)
+
+    async def _open_client(self, smtp_config: SMTPConfig) -> aiosmtplib.SMTP:
+        """Connect, upgrade and authenticate a new SMTP connection"""
+        client = aiosmtplib.SMTP(
+            hostname=smtp_config.host,
+            port=smtp_config.port,
+            use_tls=smtp_config.use_ssl,
+            start_tls=False,
+            timeout=30  # Add timeout to prevent hanging
+        )
+        async with self._mx_semaphores[smtp_config.host]:
+            await client.connect()
+            if smtp_config.use_tls:
+                await client.starttls()
+            if smtp_config.requires_auth:
+                await client.login(smtp_config.username, smtp_config.password)
+        return client
+
+    def _get_pool(self, smtp_config: SMTPConfig) -> SMTPConnectionPool:
+        key = self._client_key(smtp_config)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = SMTPConnectionPool(smtp_config, self._open_client)
+        return pool
+
+    async def _send_batch(self, smtp_config: SMTPConfig, messages: list) -> List[Optional[Exception]]:
+        """Send messages over one pooled connection, returning each message's error or None.
+
+        Raises when nothing could be sent (connect, login or first-send failure).
+        Stops early, returning fewer errors than messages, once a batch of
+        BATCH_ABORT_MIN_SIZE or more has a third of its messages failing.
+        """
+        pool = self._get_pool(smtp_config)
+        entry = await pool.acquire()
+        errors: List[Optional[Exception]] = []
+        failed = 0
+        healthy = True
+        try:
+            for message in messages:
+                try:
+                    if entry.message_count >= pool.max_messages:
+                        await pool.recycle(entry)
+                    try:
+                        await entry.client.send_message(message)
+                    except aiosmtplib.SMTPServerDisconnected:
+                        if entry.message_count == 0:
+                            raise
+                        # The server dropped an idle connection; reconnect once and retry
+                        await pool.recycle(entry)
+                        await entry.client.send_message(message)
+                    entry.message_count += 1
+                    errors.append(None)
+                except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPResponseException) as e:
+                    # Rejected by the server for this message only; keep going
+                    # unless the server is rejecting a large share of the batch
+                    errors.append(e)
+                    failed += 1
+                    if len(messages) >= BATCH_ABORT_MIN_SIZE and failed * 3 >= len(messages):
+                        logger.warning(f"Aborting batch after {failed} of {len(messages)} messages failed")
+                        break
+                except Exception as e:
+                    # The connection is unusable: fail the rest of the batch
+                    healthy = False
+                    if not errors:
+                        raise
+                    errors.extend([e] * (len(messages) - len(errors)))
+                    break
+        finally:
+            await pool.release(entry, healthy)
+        return errors
+
+    async def close_all(self) -> None:
+        """Close every pooled SMTP connection (called on application shutdown)"""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            await pool.close()
 
     def get_provider_info(self, provider: str) -> Dict[str, Any]:
         """Get information about a specific SMTP provider"""
@@ -257,46 +536,26 @@ class DynamicSMTPService:
             'use_ssl': provider_config.get('use_ssl', False)
         }
 
+    @functools.cached_property
+    def _all_providers_info(self) -> Dict[str, Dict[str, Any]]:
+        # Provider config is loaded once at startup, so this never goes stale
+        providers = config_loader.get_all_smtp_providers()
+        return {provider_key: self.get_provider_info(provider_key) for provider_key in providers}
+
     def get_all_providers_info(self) -> Dict[str, Dict[str, Any]]:
         """Get information about all available SMTP providers"""
-        providers = config_loader.get_all_smtp_providers()
-        result = {}
-        
-        for provider_key, provider_config in providers.items():
-            result[provider_key] = self.get_provider_info(provider_key)
-        
-        return result
+        return self._all_providers_info
 
     def validate_email_format(self, email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
-
-    def get_supported_domains(self) -> Dict[str, str]:
-        """Get list of supported email domains and their providers"""
-        return self.domain_provider_map.copy()
+        return _EMAIL_RE.match(email) is not None
 
+    def get_supported_domains(self) -> Mapping[str, str]:
+        """Get supported email domains and their providers (read-only)"""
+        return self.domain_provider_map
 
-# Lazy loading to avoid environment variable issues during import
-_dynamic_smtp_service_instance = None
 
-def get_dynamic_smtp_service():
-    log_function_entry(logger, "get_dynamic_smtp_service")
-    start_time = time.time()
-    try:
-        global _dynamic_smtp_service_instance
-        if _dynamic_smtp_service_instance is None:
-            _dynamic_smtp_service_instance = DynamicSMTPService()
-        duration = time.time() - start_time
-        log_performance(logger, "get_dynamic_smtp_service", duration)
-        log_function_exit(logger, "get_dynamic_smtp_service", duration=duration)
-
-        return _dynamic_smtp_service_instance
-    except Exception as e:
-        duration = time.time() - start_time
-        log_error_with_context(logger, e, "get_dynamic_smtp_service", duration=duration)
-        logger.error(f"❌ Error in get_dynamic_smtp_service: {e}")
-        log_function_exit(logger, "get_dynamic_smtp_service", duration=duration)
-        raise
-
-dynamic_smtp_service = get_dynamic_smtp_service()
+# One instance per process so every sender shares the SMTP connection pools and MX cache
+@functools.cache
+def get_dynamic_smtp_service() -> DynamicSMTPService:
+    return DynamicSMTPService()
@@ -0,0 +1,150 @@
+import asyncio
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from services.email.dynamic_smtp_service import DynamicSMTPService, OutgoingEmail
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Most messages coalesced into one batch, and how long the first one waits for company
+EMAIL_BATCH_MAX_SIZE = 64
+EMAIL_BATCH_MAX_WAIT_SECONDS = 0.5
+
+# Times an email left unsent by an aborted batch goes back on the queue before it is failed
+EMAIL_MAX_REQUEUES = 1
+
+# Queued to wake the worker when requeued emails are waiting, or when it should stop
+_WAKE = object()
+
+_SHUTDOWN_MESSAGE = "Email service shutting down"
+
+
+class EmailQueueWorker:
+    """Coalesces individual sends into batches that share one pooled SMTP connection"""
+
+    def __init__(self, smtp_service: DynamicSMTPService):
+        self._smtp_service = smtp_service
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes: set = set()
+        # Emails from aborted batches, sent ahead of anything still in the queue
+        self._requeued: deque = deque()
+        self._stopping = False
+
+    def _ensure_started(self) -> None:
+        # Started lazily so the queue and task belong to the running event loop
+        if self._worker is None or self._worker.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, email: OutgoingEmail, provider: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """Queue an email and wait for its delivery result"""
+        if self._stopping:
+            return False, _SHUTDOWN_MESSAGE
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((email, provider, future, 0))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            item = await self._queue.get()
+            batch = self._take_requeued()
+            if item is not _WAKE:
+                batch.append(item)
+            if not batch:
+                continue
+            deadline = loop.time() + EMAIL_BATCH_MAX_WAIT_SECONDS
+            while len(batch) < EMAIL_BATCH_MAX_SIZE and not self._stopping:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is not _WAKE:
+                    batch.append(item)
+
+            self._start_flush(batch)
+
+    def _start_flush(self, batch: List[tuple]) -> None:
+        # Flush in the background so a slow batch does not hold up the next;
+        # the SMTP connection pool bounds how many run at once
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    def _take_requeued(self) -> List[tuple]:
+        batch = []
+        while self._requeued and len(batch) < EMAIL_BATCH_MAX_SIZE:
+            batch.append(self._requeued.popleft())
+        return batch
+
+    async def _flush(self, batch: List[tuple]) -> None:
+        by_provider: Dict[Optional[str], List[tuple]] = {}
+        for item in batch:
+            by_provider.setdefault(item[1], []).append(item)
+
+        requeued = []
+        for provider, items in by_provider.items():
+            try:
+                results = await self._smtp_service.send_many(
+                    [email for email, _, _, _ in items], provider=provider
+                )
+            except Exception as e:
+                logger.error(f"Email batch of {len(items)} failed: {e}")
+                results = [(False, f"Email batch failed: {str(e)}")] * len(items)
+
+            for (_, _, future, _), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+            # The batch was aborted part way; give the unsent emails another chance
+            for email, item_provider, future, attempts in items[len(results):]:
+                if attempts < EMAIL_MAX_REQUEUES:
+                    requeued.append((email, item_provider, future, attempts + 1))
+                elif not future.done():
+                    future.set_result((False, "Email not sent: batch aborted after repeated failures"))
+
+        if requeued:
+            logger.warning(f"Requeued {len(requeued)} emails from an aborted batch")
+            self._requeued.extendleft(reversed(requeued))
+            self._queue.put_nowait(_WAKE)
+
+    def _drain(self) -> List[tuple]:
+        items = list(self._requeued)
+        self._requeued.clear()
+        while self._queue is not None and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _WAKE:
+                items.append(item)
+        return items
+
+    async def stop(self) -> None:
+        """Stop batching, send whatever is still queued and wait for it to finish"""
+        self._stopping = True
+        if self._worker is not None:
+            # The worker dispatches the batch it is collecting and exits; it is not cancelled
+            if not self._worker.done():
+                self._queue.put_nowait(_WAKE)
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+        # Flushes may requeue unsent emails, so drain until nothing is queued or in flight
+        pending = []
+        while True:
+            items = self._drain()
+            pending.extend(items)
+            for start in range(0, len(items), EMAIL_BATCH_MAX_SIZE):
+                self._start_flush(items[start:start + EMAIL_BATCH_MAX_SIZE])
+            if not self._flushes:
+                break
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+        for _, _, future, _ in pending:
+            if not future.done():
+                future.set_result((False, _SHUTDOWN_MESSAGE))
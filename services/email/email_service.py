@@ -1,25 +1,153 @@
 import os
-import aiosmtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import List, Optional
-from jinja2 import Template
-import logging
-import time
+import asyncio
+import functools
+from typing import Mapping, Optional
+from jinja2 import Environment
 
 from config.config_loader import config_loader
-from services.email.dynamic_smtp_service import dynamic_smtp_service
-from config.logging_config import (
-    get_logger,
-    log_function_entry,
-    log_function_exit,
-    log_performance,
-    log_error_with_context
-)
+from services.email.dynamic_smtp_service import get_dynamic_smtp_service, OutgoingEmail
+from services.email.email_queue_worker import EmailQueueWorker
+from config.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+# HTML bodies, compiled once per EmailService. Values are autoescaped; html_style
+# comes from our own template config and is inserted verbatim.
+_TEMPLATE_ENV = Environment(autoescape=True)
+
+VERIFY_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Verify Your Email - Syria GPT</title>
+    <style>{{ html_style|safe }}</style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="logo">Syria GPT</div>
+            <h1>Welcome to Syria GPT!</h1>
+        </div>
+        
+        <p>Hello <strong>{{ display_name }}</strong>,</p>
+        
+        <p>Thank you for signing up with Syria GPT! To complete your registration and start using our services, please verify your email address by clicking the button below:</p>
+        
+        <div style="text-align: center;">
+            <a href="{{ verification_url }}" class="verify-btn">Verify Email Address</a>
+        </div>
+        
+        <p>If the button above doesn't work, you can also copy and paste the following link into your browser:</p>
+        <p style="word-break: break-all; background-color: #f8f9fa; padding: 10px; border-radius: 5px; font-family: monospace;">{{ verification_url }}</p>
+        
+        <div class="warning">
+            <strong>Security Notice:</strong> This verification link will expire in 24 hours. If you didn't create an account with Syria GPT, please ignore this email.
+        </div>
+        
+        <p>Once verified, you'll be able to access all our features and services. If you have any questions or need assistance, don't hesitate to contact our support team.</p>
+        
+        <p>Welcome aboard!</p>
+        
+        <div class="footer">
+            <p>&copy; 2024 Syria GPT. All rights reserved.</p>
+            <p>This is an automated message. Please do not reply to this email.</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+WELCOME_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Welcome to Syria GPT</title>
+    <style>{{ html_style|safe }}</style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="logo">Syria GPT</div>
+            <h1>Email Successfully Verified!</h1>
+        </div>
+        
+        <div class="success">
+            ✅ Your email has been successfully verified!
+        </div>
+        
+        <p>Hello <strong>{{ display_name }}</strong>,</p>
+        
+        <p>Congratulations! Your email address has been verified and your Syria GPT account is now fully active.</p>
+        
+        <p>You can now enjoy all the features and services that Syria GPT has to offer. Start exploring and make the most of your experience with us!</p>
+        
+        <div style="text-align: center;">
+            <a href="{{ frontend_url }}" class="cta-btn">Start Using Syria GPT</a>
+        </div>
+        
+        <p>If you have any questions or need assistance, our support team is here to help.</p>
+        
+        <p>Thank you for choosing Syria GPT!</p>
+        
+        <div class="footer">
+            <p>&copy; 2024 Syria GPT. All rights reserved.</p>
+            <p>This is an automated message. Please do not reply to this email.</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+PASSWORD_RESET_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Reset Your Password - Syria GPT</title>
+    <style>{{ html_style|safe }}</style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="logo">Syria GPT</div>
+            <h1>Reset Your Password</h1>
+        </div>
+        
+        <p>Hello <strong>{{ display_name }}</strong>,</p>
+        
+        <p>We received a request to reset your password for your Syria GPT account. If you didn't make this request, you can safely ignore this email.</p>
+        
+        <p>To reset your password, click the button below:</p>
+        
+        <div style="text-align: center;">
+            <a href="{{ reset_link }}" class="reset-btn">Reset Password</a>
+        </div>
+        
+        <p>If the button above doesn't work, you can also copy and paste the following link into your browser:</p>
+        <p style="word-break: break-all; background-color: #f8f9fa; padding: 10px; border-radius: 5px; font-family: monospace;">{{ reset_link }}</p>
+        
+        <div class="warning">
+            <strong>Security Notice:</strong> This password reset link will expire in 60 minutes. For security reasons, please do not share this link with anyone.
+        </div>
+        
+        <p>If you have any questions or need assistance, please contact our support team.</p>
+        
+        <div class="footer">
+            <p>&copy; 2024 Syria GPT. All rights reserved.</p>
+            <p>This is an automated message. Please do not reply to this email.</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
 class EmailService:
     def __init__(self):
         self.smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
@@ -30,6 +158,13 @@ class EmailService:
         self.email_from_name = os.getenv("EMAIL_FROM_NAME", "Syria GPT")
         self.frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
         self.backend_url = os.getenv("BACKEND_URL", "http://localhost:9000")
+        self._env = os.getenv("ENV")
+        self._smtp_service = get_dynamic_smtp_service()
+        self._queue_worker = EmailQueueWorker(self._smtp_service)
+        
+        self._tmpl_verify = _TEMPLATE_ENV.from_string(VERIFY_HTML_TEMPLATE)
+        self._tmpl_welcome = _TEMPLATE_ENV.from_string(WELCOME_HTML_TEMPLATE)
+        self._tmpl_password_reset = _TEMPLATE_ENV.from_string(PASSWORD_RESET_HTML_TEMPLATE)
 
     async def send_email(
         self,
@@ -39,15 +174,16 @@ class EmailService:
         text_content: Optional[str] = None,
         provider: Optional[str] = None
     ) -> tuple[bool, Optional[str]]:
-        """Send email using dynamic SMTP configuration"""
-        return await dynamic_smtp_service.send_email(
-            to_email=to_email,
-            subject=subject,
-            html_content=html_content,
-            text_content=text_content,
+        """Send email using dynamic SMTP configuration, batched with concurrent sends"""
+        return await self._queue_worker.submit(
+            OutgoingEmail(to_email, subject, html_content, text_content),
             provider=provider
         )
 
+    async def close(self) -> None:
+        """Flush queued email (called on application shutdown)"""
+        await self._queue_worker.stop()
+
     async def send_verification_email(
         self,
         to_email: str,
@@ -120,10 +256,24 @@ class EmailService:
             text_content=text_content
         )
 
+    async def send_welcome_email_bulk(
+        self,
+        recipients: list[tuple[str, Optional[str]]]
+    ) -> list[tuple[bool, Optional[str]]]:
+        """Send welcome emails to (email, name) pairs concurrently; the queue worker batches them"""
+        results = await asyncio.gather(
+            *(self.send_welcome_email(to_email, user_name) for to_email, user_name in recipients),
+            return_exceptions=True
+        )
+        return [
+            (False, f"Failed to send welcome email: {str(result)}") if isinstance(result, Exception) else result
+            for result in results
+        ]
+
     def is_configured(self) -> bool:
         # For development, allow email service to work without SMTP credentials
         # In production, you would want to require proper SMTP configuration
-        if os.getenv("ENV") == "development":
+        if self._env == "development":
             return True
         return all([
             self.smtp_user,
@@ -134,192 +284,55 @@ class EmailService:
 
     async def test_smtp_connection(self, email: str, password: str, provider: Optional[str] = None) -> tuple[bool, str]:
         """Test SMTP connection with the provided credentials"""
-        return await dynamic_smtp_service.test_smtp_connection(email, password, provider)
+        return await self._smtp_service.test_smtp_connection(email, password, provider)
 
     def get_provider_info(self, provider: str) -> dict:
         """Get information about a specific SMTP provider"""
-        return dynamic_smtp_service.get_provider_info(provider)
+        return self._smtp_service.get_provider_info(provider)
 
     def get_all_providers_info(self) -> dict:
         """Get information about all available SMTP providers"""
-        return dynamic_smtp_service.get_all_providers_info()
+        return self._smtp_service.get_all_providers_info()
 
     def detect_provider_from_email(self, email: str) -> str:
         """Detect email provider from email address domain"""
-        return dynamic_smtp_service.detect_provider_from_email(email)
+        return self._smtp_service.detect_provider_from_email(email)
+
+    async def resolve_provider(self, email: str) -> str:
+        """Detect email provider, falling back to an MX lookup for custom domains"""
+        return await self._smtp_service.resolve_provider(email)
 
     def validate_email_format(self, email: str) -> bool:
         """Validate email format"""
-        return dynamic_smtp_service.validate_email_format(email)
+        return self._smtp_service.validate_email_format(email)
 
-    def get_supported_domains(self) -> dict:
+    def get_supported_domains(self) -> Mapping[str, str]:
         """Get list of supported email domains and their providers"""
-        return dynamic_smtp_service.get_supported_domains()
+        return self._smtp_service.get_supported_domains()
 
     def _build_verification_html(self, display_name: str, verification_url: str, template_config: dict) -> str:
-        html_style = template_config.get("html_style", "")
-        
-        html_template = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Verify Your Email - Syria GPT</title>
-            <style>{html_style}</style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <div class="logo">Syria GPT</div>
-                    <h1>Welcome to Syria GPT!</h1>
-                </div>
-                
-                <p>Hello <strong>{display_name}</strong>,</p>
-                
-                <p>Thank you for signing up with Syria GPT! To complete your registration and start using our services, please verify your email address by clicking the button below:</p>
-                
-                <div style="text-align: center;">
-                    <a href="{verification_url}" class="verify-btn">Verify Email Address</a>
-                </div>
-                
-                <p>If the button above doesn't work, you can also copy and paste the following link into your browser:</p>
-                <p style="word-break: break-all; background-color: #f8f9fa; padding: 10px; border-radius: 5px; font-family: monospace;">{verification_url}</p>
-                
-                <div class="warning">
-                    <strong>Security Notice:</strong> This verification link will expire in 24 hours. If you didn't create an account with Syria GPT, please ignore this email.
-                </div>
-                
-                <p>Once verified, you'll be able to access all our features and services. If you have any questions or need assistance, don't hesitate to contact our support team.</p>
-                
-                <p>Welcome aboard!</p>
-                
-                <div class="footer">
-                    <p>&copy; 2024 Syria GPT. All rights reserved.</p>
-                    <p>This is an automated message. Please do not reply to this email.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return html_template
+        return self._tmpl_verify.render(
+            display_name=display_name,
+            verification_url=verification_url,
+            html_style=template_config.get("html_style", "")
+        )
 
     def _build_welcome_html(self, display_name: str, template_config: dict) -> str:
-        html_style = template_config.get("html_style", "")
-        
-        html_template = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Welcome to Syria GPT</title>
-            <style>{html_style}</style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <div class="logo">Syria GPT</div>
-                    <h1>Email Successfully Verified!</h1>
-                </div>
-                
-                <div class="success">
-                    ✅ Your email has been successfully verified!
-                </div>
-                
-                <p>Hello <strong>{display_name}</strong>,</p>
-                
-                <p>Congratulations! Your email address has been verified and your Syria GPT account is now fully active.</p>
-                
-                <p>You can now enjoy all the features and services that Syria GPT has to offer. Start exploring and make the most of your experience with us!</p>
-                
-                <div style="text-align: center;">
-                    <a href="{self.frontend_url}" class="cta-btn">Start Using Syria GPT</a>
-                </div>
-                
-                <p>If you have any questions or need assistance, our support team is here to help.</p>
-                
-                <p>Thank you for choosing Syria GPT!</p>
-                
-                <div class="footer">
-                    <p>&copy; 2024 Syria GPT. All rights reserved.</p>
-                    <p>This is an automated message. Please do not reply to this email.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return html_template
+        return self._tmpl_welcome.render(
+            display_name=display_name,
+            frontend_url=self.frontend_url,
+            html_style=template_config.get("html_style", "")
+        )
 
     def _build_password_reset_html(self, display_name: str, reset_link: str, template_config: dict) -> str:
-        html_style = template_config.get("html_style", "")
-        
-        html_template = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Reset Your Password - Syria GPT</title>
-            <style>{html_style}</style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <div class="logo">Syria GPT</div>
-                    <h1>Reset Your Password</h1>
-                </div>
-                
-                <p>Hello <strong>{display_name}</strong>,</p>
-                
-                <p>We received a request to reset your password for your Syria GPT account. If you didn't make this request, you can safely ignore this email.</p>
-                
-                <p>To reset your password, click the button below:</p>
-                
-                <div style="text-align: center;">
-                    <a href="{reset_link}" class="reset-btn">Reset Password</a>
-                </div>
-                
-                <p>If the button above doesn't work, you can also copy and paste the following link into your browser:</p>
-                <p style="word-break: break-all; background-color: #f8f9fa; padding: 10px; border-radius: 5px; font-family: monospace;">{reset_link}</p>
-                
-                <div class="warning">
-                    <strong>Security Notice:</strong> This password reset link will expire in 60 minutes. For security reasons, please do not share this link with anyone.
-                </div>
-                
-                <p>If you have any questions or need assistance, please contact our support team.</p>
-                
-                <div class="footer">
-                    <p>&copy; 2024 Syria GPT. All rights reserved.</p>
-                    <p>This is an automated message. Please do not reply to this email.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return html_template
-
-
-# Lazy loading to avoid environment variable issues during import
-_email_service_instance = None
-
-def get_email_service():
-    log_function_entry(logger, "get_email_service")
-    start_time = time.time()
-    try:
-        global _email_service_instance
-        if _email_service_instance is None:
-            _email_service_instance = EmailService()
-        duration = time.time() - start_time
-        log_performance(logger, "get_email_service", duration)
-        log_function_exit(logger, "get_email_service", duration=duration)
+        return self._tmpl_password_reset.render(
+            display_name=display_name,
+            reset_link=reset_link,
+            html_style=template_config.get("html_style", "")
+        )
 
-        return _email_service_instance
-    except Exception as e:
-        duration = time.time() - start_time
-        log_error_with_context(logger, e, "get_email_service", duration=duration)
-        logger.error(f"❌ Error in get_email_service: {e}")
-        log_function_exit(logger, "get_email_service", duration=duration)
-        raise
 
-email_service = get_email_service()
\ No newline at end of file
+# Created lazily: the constructor reads SMTP_* env vars and builds the shared SMTP service
+@functools.cache
+def get_email_service() -> EmailService:
+    return EmailService()
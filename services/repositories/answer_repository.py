@@ -1,4 +1,5 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert, select, lambda_stmt, bindparam
 from sqlalchemy.orm import Session
 from models.domain.answer import Answer
 import uuid
@@ -7,7 +8,7 @@ class AnswerRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_answer(self, answer: str, question_id: uuid.UUID, user_id: uuid.UUID, author: str) -> Answer:
+    def create_answer(self, answer: str, question_id: uuid.UUID, user_id: uuid.UUID, author: str, refresh: bool = False) -> Answer:
         """إنشاء إجابة جديدة"""
         db_answer = Answer(
             answer=answer,
@@ -17,12 +18,25 @@ class AnswerRepository:
         )
         self.db.add(db_answer)
         self.db.commit()
-        self.db.refresh(db_answer)
+        # created_at comes back through INSERT ... RETURNING; refresh only on request
+        if refresh:
+            self.db.refresh(db_answer)
         return db_answer
 
+    def create_answers_bulk(self, rows: List[Dict[str, Any]]) -> List[uuid.UUID]:
+        """إنشاء عدة إجابات في عبارة INSERT واحدة وإرجاع معرفاتها"""
+        if not rows:
+            return []
+        # One multi-row INSERT ... RETURNING instead of a commit per answer
+        result = self.db.execute(insert(Answer).returning(Answer.id), rows)
+        answer_ids = list(result.scalars())
+        self.db.commit()
+        return answer_ids
+
     def get_answer_by_id(self, answer_id: uuid.UUID) -> Optional[Answer]:
         """الحصول على إجابة بواسطة المعرف"""
-        return self.db.query(Answer).filter(Answer.id == answer_id).first()
+        stmt = lambda_stmt(lambda: select(Answer).where(Answer.id == bindparam("answer_id")))
+        return self.db.scalars(stmt, {"answer_id": answer_id}).first()
 
     def get_answers_by_question_id(self, question_id: uuid.UUID) -> List[Answer]:
         """الحصول على جميع إجابات سؤال معين"""
@@ -1,104 +1,180 @@
+import functools
 import logging
-import time
-from typing import List, Dict, Any, Optional, Tuple
+import os
+import threading
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy.orm import Session, selectinload, raiseload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, or_, func, desc, asc, distinct, tuple_, select, lambda_stmt, bindparam
 from sqlalchemy.exc import SQLAlchemyError
+from cachetools import TTLCache
 import uuid
 
 from models.domain.chat import Chat, ChatMessage, ChatFeedback, ChatSettings
 from models.domain.user import User
-from config.logging_config import get_logger, log_function_entry, log_function_exit, log_performance, log_error_with_context
+from config.logging_config import get_logger, log_error_with_context, traced
 
 logger = get_logger(__name__)
 
+# List-style queries raise on any relationship they did not load explicitly,
+# so a hidden per-row lazy load fails loudly instead of issuing N SELECTs
+SQLALCHEMY_RAISELOAD_STRICT = os.getenv("SQLALCHEMY_RAISELOAD_STRICT", "true").lower() == "true"
+
+
+UUIDLike = Union[str, uuid.UUID]
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_uuid(value: str) -> uuid.UUID:
+    return uuid.UUID(value)
+
+
+def _to_uuid(value: UUIDLike) -> uuid.UUID:
+    """Parse an ID once: UUIDs pass through and repeated strings come from the cache"""
+    return value if isinstance(value, uuid.UUID) else _parse_uuid(value)
+
+
+# Per-user chat settings, read on every chat create/message; dropped on update
+CHAT_SETTINGS_CACHE_TTL = 60
+CHAT_SETTINGS_CACHE_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class ChatSettingsSnapshot:
+    """Detached copy of a ChatSettings row that can be shared across sessions"""
+    id: uuid.UUID
+    user_id: uuid.UUID
+    default_language: str
+    default_model: str
+    default_max_tokens: int
+    default_temperature: float
+    auto_archive_after_days: int
+    max_chats_per_user: int
+    max_messages_per_chat: int
+    enable_voice_input: bool
+    enable_file_upload: bool
+    enable_image_analysis: bool
+    enable_context_memory: bool
+    enable_chat_history: bool
+    enable_analytics: bool
+    enable_feedback: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_model(cls, settings: ChatSettings) -> "ChatSettingsSnapshot":
+        return cls(**{column.key: getattr(settings, column.key) for column in ChatSettings.__table__.columns})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return ChatSettings.to_dict(self)
+
+
+_settings_cache: TTLCache = TTLCache(maxsize=CHAT_SETTINGS_CACHE_SIZE, ttl=CHAT_SETTINGS_CACHE_TTL)
+_settings_cache_lock = threading.Lock()
+
+
+def _list_options(*options):
+    """Loader options for list queries, with raiseload("*") when strict mode is on"""
+    if SQLALCHEMY_RAISELOAD_STRICT:
+        return (*options, raiseload("*"))
+    return options
+
 
 class ChatRepository:
     """Repository for chat-related database operations"""
     
+    # search_chats filter key -> condition builder
+    _FILTERS = {
+        "title": lambda v: Chat.title.ilike(f"%{v}%"),
+        "language": lambda v: Chat.language == v,
+        "model_preference": lambda v: Chat.model_preference == v,
+        "is_archived": lambda v: Chat.is_archived == v,
+        "is_pinned": lambda v: Chat.is_pinned == v,
+        "created_after": lambda v: Chat.created_at >= v,
+        "created_before": lambda v: Chat.created_at <= v,
+        "updated_after": lambda v: Chat.updated_at >= v,
+        "updated_before": lambda v: Chat.updated_at <= v,
+        "message_count_min": lambda v: Chat.message_count >= v,
+        "message_count_max": lambda v: Chat.message_count <= v,
+    }
+    
     def __init__(self, db_session: Session):
         self.db = db_session
     
-    def create_chat(self, user_id: str, **kwargs) -> Chat:
+    @traced(logger, "create_chat")
+    def create_chat(self, user_id: UUIDLike, refresh: bool = False, **kwargs) -> Chat:
         """Create a new chat"""
-        start_time = time.time()
         try:
             chat = Chat(
-                user_id=uuid.UUID(user_id),
+                user_id=_to_uuid(user_id),
                 **kwargs
             )
             self.db.add(chat)
             self.db.commit()
-            self.db.refresh(chat)
+            # Every column is filled client-side on insert; refresh only on request
+            if refresh:
+                self.db.refresh(chat)
             
-            duration = time.time() - start_time
-            log_performance(logger, "create_chat", duration)
-            log_function_exit(logger, "create_chat", duration=duration)
             return chat
         except Exception as e:
             self.db.rollback()
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "create_chat", duration=duration)
-            logger.error(f"❌ Error creating chat: {e}")
-            log_function_exit(logger, "create_chat", duration=duration)
+            log_error_with_context(logger, e, "create_chat")
             raise
     
-    def get_chat_by_id(self, chat_id: str, user_id: str) -> Optional[Chat]:
+    def _get_chat_by_uuid(self, chat_uuid: uuid.UUID, user_uuid: uuid.UUID) -> Optional[Chat]:
+        # Cached lambda statement: built and compiled once, only the parameters change per call
+        stmt = lambda_stmt(lambda: select(Chat).where(
+            Chat.id == bindparam("chat_id"),
+            Chat.user_id == bindparam("user_id")
+        ))
+        return self.db.scalars(stmt, {"chat_id": chat_uuid, "user_id": user_uuid}).first()
+    
+    @traced(logger, "get_chat_by_id")
+    def get_chat_by_id(self, chat_id: UUIDLike, user_id: UUIDLike) -> Optional[Chat]:
         """Get chat by ID for specific user"""
-        start_time = time.time()
         try:
-            chat = self.db.query(Chat).filter(
-                and_(
-                    Chat.id == uuid.UUID(chat_id),
-                    Chat.user_id == uuid.UUID(user_id)
-                )
-            ).first()
+            chat = self._get_chat_by_uuid(_to_uuid(chat_id), _to_uuid(user_id))
             
-            duration = time.time() - start_time
-            log_performance(logger, "get_chat_by_id", duration)
-            log_function_exit(logger, "get_chat_by_id", duration=duration)
             return chat
         except Exception as e:
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "get_chat_by_id", duration=duration)
-            logger.error(f"❌ Error getting chat by ID: {e}")
-            log_function_exit(logger, "get_chat_by_id", duration=duration)
+            log_error_with_context(logger, e, "get_chat_by_id")
             raise
     
-    def get_chat_with_messages(self, chat_id: str, user_id: str, limit: int = 100) -> Optional[Chat]:
+    @traced(logger, "get_chat_with_messages")
+    def get_chat_with_messages(self, chat_id: UUIDLike, user_id: UUIDLike, limit: int = 100) -> Optional[Chat]:
         """Get chat with messages"""
-        start_time = time.time()
         try:
-            chat = self.db.query(Chat).options(
-                joinedload(Chat.messages).joinedload(ChatMessage.user)
-            ).filter(
+            chat = self.db.query(Chat).options(*_list_options()).filter(
                 and_(
-                    Chat.id == uuid.UUID(chat_id),
-                    Chat.user_id == uuid.UUID(user_id)
+                    Chat.id == _to_uuid(chat_id),
+                    Chat.user_id == _to_uuid(user_id)
                 )
             ).first()
             
             if chat:
-                # Limit messages to most recent
-                chat.messages = sorted(chat.messages, key=lambda x: x.created_at, reverse=True)[:limit]
+                # Limit messages to most recent in SQL rather than loading the whole history
+                messages = self.db.query(ChatMessage).options(
+                    *_list_options(selectinload(ChatMessage.user))
+                ).filter(
+                    ChatMessage.chat_id == chat.id
+                ).order_by(desc(ChatMessage.created_at)).limit(limit).all()
+                
+                # Attach without marking the collection changed, so the older
+                # messages are not treated as removed (delete-orphan) on commit
+                set_committed_value(chat, "messages", messages)
             
-            duration = time.time() - start_time
-            log_performance(logger, "get_chat_with_messages", duration)
-            log_function_exit(logger, "get_chat_with_messages", duration=duration)
             return chat
         except Exception as e:
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "get_chat_with_messages", duration=duration)
-            logger.error(f"❌ Error getting chat with messages: {e}")
-            log_function_exit(logger, "get_chat_with_messages", duration=duration)
+            log_error_with_context(logger, e, "get_chat_with_messages")
             raise
     
-    def update_chat(self, chat_id: str, user_id: str, **kwargs) -> Optional[Chat]:
-        """Update chat"""
-        start_time = time.time()
+    @traced(logger, "update_chat")
+    def update_chat(self, chat_id: UUIDLike, user_id: UUIDLike, commit: bool = True, **kwargs) -> Optional[Chat]:
+        """Update chat; with commit=False the change is only flushed so callers can batch it"""
         try:
-            chat = self.get_chat_by_id(chat_id, user_id)
+            chat = self._get_chat_by_uuid(_to_uuid(chat_id), _to_uuid(user_id))
             if not chat:
                 return None
             
@@ -106,300 +182,322 @@ class ChatRepository:
                 if hasattr(chat, key):
                     setattr(chat, key, value)
             
-            chat.updated_at = datetime.utcnow()
+            if not commit:
+                self.db.flush()
+                return chat
             self.db.commit()
             self.db.refresh(chat)
             
-            duration = time.time() - start_time
-            log_performance(logger, "update_chat", duration)
-            log_function_exit(logger, "update_chat", duration=duration)
             return chat
         except Exception as e:
             self.db.rollback()
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "update_chat", duration=duration)
-            logger.error(f"❌ Error updating chat: {e}")
-            log_function_exit(logger, "update_chat", duration=duration)
+            log_error_with_context(logger, e, "update_chat")
             raise
     
-    def delete_chat(self, chat_id: str, user_id: str) -> bool:
-        """Delete chat"""
-        start_time = time.time()
+    @traced(logger, "delete_chat")
+    def delete_chat(self, chat_id: UUIDLike, user_id: UUIDLike, commit: bool = True) -> bool:
+        """Delete chat; with commit=False the delete is only flushed so callers can batch it"""
         try:
-            chat = self.get_chat_by_id(chat_id, user_id)
+            chat = self._get_chat_by_uuid(_to_uuid(chat_id), _to_uuid(user_id))
             if not chat:
                 return False
             
             self.db.delete(chat)
-            self.db.commit()
+            if commit:
+                self.db.commit()
+            else:
+                self.db.flush()
             
-            duration = time.time() - start_time
-            log_performance(logger, "delete_chat", duration)
-            log_function_exit(logger, "delete_chat", duration=duration)
             return True
         except Exception as e:
             self.db.rollback()
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "delete_chat", duration=duration)
-            logger.error(f"❌ Error deleting chat: {e}")
-            log_function_exit(logger, "delete_chat", duration=duration)
+            log_error_with_context(logger, e, "delete_chat")
             raise
     
-    def search_chats(self, user_id: str, **filters) -> Tuple[List[Chat], int]:
-        """Search chats with filters"""
-        start_time = time.time()
+    @traced(logger, "search_chats")
+    def search_chats(
+        self,
+        user_id: UUIDLike,
+        fields: Optional[List[str]] = None,
+        **filters
+    ) -> Tuple[List[Chat], Optional[int]]:
+        """Search chats with filters; pass skip_total=True to skip counting (total is None).
+        
+        With cursor=(updated_at, id) of the last chat seen, the next page is read by
+        keyset instead of offset and no total is returned. fields limits the columns
+        loaded (id and updated_at are always included); other columns raise on access.
+        """
         try:
-            query = self.db.query(Chat).filter(Chat.user_id == uuid.UUID(user_id))
-            
-            # Apply filters
-            if filters.get('title'):
-                query = query.filter(Chat.title.ilike(f"%{filters['title']}%"))
-            
-            if filters.get('language'):
-                query = query.filter(Chat.language == filters['language'])
-            
-            if filters.get('model_preference'):
-                query = query.filter(Chat.model_preference == filters['model_preference'])
-            
-            if filters.get('is_archived') is not None:
-                query = query.filter(Chat.is_archived == filters['is_archived'])
-            
-            if filters.get('is_pinned') is not None:
-                query = query.filter(Chat.is_pinned == filters['is_pinned'])
-            
-            if filters.get('created_after'):
-                query = query.filter(Chat.created_at >= filters['created_after'])
-            
-            if filters.get('created_before'):
-                query = query.filter(Chat.created_at <= filters['created_before'])
-            
-            if filters.get('updated_after'):
-                query = query.filter(Chat.updated_at >= filters['updated_after'])
-            
-            if filters.get('updated_before'):
-                query = query.filter(Chat.updated_at <= filters['updated_before'])
-            
-            if filters.get('message_count_min'):
-                query = query.filter(Chat.message_count >= filters['message_count_min'])
-            
-            if filters.get('message_count_max'):
-                query = query.filter(Chat.message_count <= filters['message_count_max'])
-            
-            # Get total count
-            total_count = query.count()
-            
-            # Apply pagination
+            options = _list_options()
+            if fields:
+                columns = {"id", "updated_at", *fields}
+                options = (load_only(*(getattr(Chat, name) for name in columns), raiseload=True), *options)
+            query = self.db.query(Chat).options(*options).filter(Chat.user_id == _to_uuid(user_id))
+            
+            # Only the filters actually provided are visited; booleans apply when
+            # False too, other values only when truthy (as before)
+            conditions = [
+                self._FILTERS[key](value)
+                for key, value in filters.items()
+                if key in self._FILTERS and (value or isinstance(value, bool))
+            ]
+            if conditions:
+                query = query.filter(*conditions)
+            
+            # Apply pagination: keyset on (updated_at, id) when a cursor is given, else offset
             page = filters.get('page', 1)
             page_size = filters.get('page_size', 10)
-            offset = (page - 1) * page_size
-            
-            chats = query.order_by(desc(Chat.updated_at)).offset(offset).limit(page_size).all()
+            cursor = filters.get('cursor')
+            if cursor:
+                cursor_updated_at, cursor_id = cursor
+                query = query.filter(
+                    tuple_(Chat.updated_at, Chat.id) < tuple_(cursor_updated_at, _to_uuid(cursor_id))
+                )
+                offset = 0
+            else:
+                offset = (page - 1) * page_size
+            query = query.order_by(desc(Chat.updated_at), desc(Chat.id)).offset(offset).limit(page_size)
+            
+            # A window count past a cursor would only cover the remaining rows
+            if filters.get('skip_total') or cursor:
+                chats = query.all()
+                total_count = None
+            else:
+                # Total comes back with the page as a window count: one scan, one round trip
+                rows = query.add_columns(func.count().over().label("total_count")).all()
+                chats = [row[0] for row in rows]
+                if rows:
+                    total_count = rows[0].total_count
+                else:
+                    # Past the last page there are no rows to carry the total
+                    total_count = query.limit(None).offset(None).order_by(None).count() if offset else 0
             
-            duration = time.time() - start_time
-            log_performance(logger, "search_chats", duration)
-            log_function_exit(logger, "search_chats", duration=duration)
             return chats, total_count
         except Exception as e:
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "search_chats", duration=duration)
-            logger.error(f"❌ Error searching chats: {e}")
-            log_function_exit(logger, "search_chats", duration=duration)
+            log_error_with_context(logger, e, "search_chats")
             raise
     
-    def create_message(self, chat_id: str, user_id: str, **kwargs) -> ChatMessage:
+    @traced(logger, "create_message")
+    def create_message(self, chat_id: UUIDLike, user_id: UUIDLike, refresh: bool = False, **kwargs) -> ChatMessage:
         """Create a new chat message"""
-        start_time = time.time()
         try:
+            chat_uuid = _to_uuid(chat_id)
+            user_uuid = _to_uuid(user_id)
             message = ChatMessage(
-                chat_id=uuid.UUID(chat_id),
-                user_id=uuid.UUID(user_id),
+                chat_id=chat_uuid,
+                user_id=user_uuid,
                 **kwargs
             )
             self.db.add(message)
             
-            # Update chat message count and last message time
-            chat = self.get_chat_by_id(chat_id, user_id)
-            if chat:
-                chat.message_count += 1
-                chat.last_message_at = datetime.utcnow()
-                chat.updated_at = datetime.utcnow()
+            # Update chat message count and last message time in the same transaction;
+            # the increment happens in SQL so concurrent messages are not lost. Sessions keep
+            # objects across commits, so "evaluate" applies it to a Chat already loaded here too
+            now = datetime.utcnow()
+            self.db.query(Chat).filter(
+                and_(
+                    Chat.id == chat_uuid,
+                    Chat.user_id == user_uuid
+                )
+            ).update(
+                {
+                    Chat.message_count: Chat.message_count + 1,
+                    Chat.last_message_at: now
+                },
+                synchronize_session="evaluate"
+            )
             
             self.db.commit()
-            self.db.refresh(message)
+            if refresh:
+                self.db.refresh(message)
             
-            duration = time.time() - start_time
-            log_performance(logger, "create_message", duration)
-            log_function_exit(logger, "create_message", duration=duration)
             return message
         except Exception as e:
             self.db.rollback()
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "create_message", duration=duration)
-            logger.error(f"❌ Error creating message: {e}")
-            log_function_exit(logger, "create_message", duration=duration)
+            log_error_with_context(logger, e, "create_message")
             raise
     
-    def get_message_by_id(self, message_id: str) -> Optional[ChatMessage]:
+    @traced(logger, "get_message_by_id")
+    def get_message_by_id(self, message_id: UUIDLike) -> Optional[ChatMessage]:
         """Get message by ID"""
-        start_time = time.time()
         try:
-            message = self.db.query(ChatMessage).filter(
-                ChatMessage.id == uuid.UUID(message_id)
-            ).first()
+            stmt = lambda_stmt(lambda: select(ChatMessage).where(ChatMessage.id == bindparam("message_id")))
+            message = self.db.scalars(stmt, {"message_id": _to_uuid(message_id)}).first()
             
-            duration = time.time() - start_time
-            log_performance(logger, "get_message_by_id", duration)
-            log_function_exit(logger, "get_message_by_id", duration=duration)
             return message
         except Exception as e:
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "get_message_by_id", duration=duration)
-            logger.error(f"❌ Error getting message by ID: {e}")
-            log_function_exit(logger, "get_message_by_id", duration=duration)
+            log_error_with_context(logger, e, "get_message_by_id")
             raise
     
-    def get_chat_messages(self, chat_id: str, user_id: str, limit: int = 100, offset: int = 0) -> List[ChatMessage]:
-        """Get messages for a chat"""
-        start_time = time.time()
+    @traced(logger, "get_chat_messages")
+    def get_chat_messages(
+        self,
+        chat_id: UUIDLike,
+        user_id: UUIDLike,
+        limit: int = 100,
+        cursor: Optional[Tuple[datetime, UUIDLike]] = None
+    ) -> List[ChatMessage]:
+        """Get messages for a chat, newest first.
+        
+        Pass cursor=(created_at, id) of the last message of the previous page to
+        read the next one; each page is an index range scan regardless of depth.
+        """
         try:
-            messages = self.db.query(ChatMessage).filter(
+            query = self.db.query(ChatMessage).options(*_list_options()).filter(
                 and_(
-                    ChatMessage.chat_id == uuid.UUID(chat_id),
-                    ChatMessage.user_id == uuid.UUID(user_id)
+                    ChatMessage.chat_id == _to_uuid(chat_id),
+                    ChatMessage.user_id == _to_uuid(user_id)
+                )
+            )
+            if cursor:
+                cursor_created_at, cursor_id = cursor
+                query = query.filter(
+                    tuple_(ChatMessage.created_at, ChatMessage.id) < tuple_(cursor_created_at, _to_uuid(cursor_id))
                 )
-            ).order_by(desc(ChatMessage.created_at)).offset(offset).limit(limit).all()
+            messages = query.order_by(
+                desc(ChatMessage.created_at), desc(ChatMessage.id)
+            ).limit(limit).all()
             
-            duration = time.time() - start_time
-            log_performance(logger, "get_chat_messages", duration)
-            log_function_exit(logger, "get_chat_messages", duration=duration)
             return messages
         except Exception as e:
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "get_chat_messages", duration=duration)
-            logger.error(f"❌ Error getting chat messages: {e}")
-            log_function_exit(logger, "get_chat_messages", duration=duration)
+            log_error_with_context(logger, e, "get_chat_messages")
             raise
     
-    def create_feedback(self, message_id: str, user_id: str, **kwargs) -> ChatFeedback:
+    @traced(logger, "create_feedback")
+    def create_feedback(self, message_id: UUIDLike, user_id: UUIDLike, refresh: bool = False, **kwargs) -> ChatFeedback:
         """Create feedback for a message"""
-        start_time = time.time()
         try:
+            message_uuid = _to_uuid(message_id)
             feedback = ChatFeedback(
-                message_id=uuid.UUID(message_id),
-                user_id=uuid.UUID(user_id),
+                message_id=message_uuid,
+                user_id=_to_uuid(user_id),
                 **kwargs
             )
             self.db.add(feedback)
             
-            # Update message with feedback
-            message = self.get_message_by_id(message_id)
-            if message:
-                message.feedback_rating = kwargs.get('rating')
-                message.feedback_comment = kwargs.get('comment')
+            # Update message with feedback, and any copy of it already loaded in the session
+            self.db.query(ChatMessage).filter(
+                ChatMessage.id == message_uuid
+            ).update(
+                {
+                    ChatMessage.feedback_rating: kwargs.get('rating'),
+                    ChatMessage.feedback_comment: kwargs.get('comment')
+                },
+                synchronize_session="evaluate"
+            )
             
             self.db.commit()
-            self.db.refresh(feedback)
+            if refresh:
+                self.db.refresh(feedback)
             
-            duration = time.time() - start_time
-            log_performance(logger, "create_feedback", duration)
-            log_function_exit(logger, "create_feedback", duration=duration)
             return feedback
         except Exception as e:
             self.db.rollback()
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "create_feedback", duration=duration)
-            logger.error(f"❌ Error creating feedback: {e}")
-            log_function_exit(logger, "create_feedback", duration=duration)
+            log_error_with_context(logger, e, "create_feedback")
             raise
     
-    def get_or_create_chat_settings(self, user_id: str) -> ChatSettings:
-        """Get or create chat settings for user"""
-        start_time = time.time()
+    @traced(logger, "get_or_create_chat_settings")
+    def get_or_create_chat_settings(self, user_id: UUIDLike) -> ChatSettingsSnapshot:
+        """Get or create chat settings for user, served from a short-lived cache"""
         try:
-            settings = self.db.query(ChatSettings).filter(
-                ChatSettings.user_id == uuid.UUID(user_id)
-            ).first()
+            user_uuid = _to_uuid(user_id)
+            with _settings_cache_lock:
+                snapshot = _settings_cache.get(user_uuid)
+            if snapshot is not None:
+                return snapshot
             
-            if not settings:
-                settings = ChatSettings(user_id=uuid.UUID(user_id))
-                self.db.add(settings)
-                self.db.commit()
-                self.db.refresh(settings)
+            snapshot = ChatSettingsSnapshot.from_model(self._get_or_create_settings_row(user_uuid))
+            with _settings_cache_lock:
+                _settings_cache[user_uuid] = snapshot
             
-            duration = time.time() - start_time
-            log_performance(logger, "get_or_create_chat_settings", duration)
-            log_function_exit(logger, "get_or_create_chat_settings", duration=duration)
-            return settings
+            return snapshot
         except Exception as e:
             self.db.rollback()
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "get_or_create_chat_settings", duration=duration)
-            logger.error(f"❌ Error getting/creating chat settings: {e}")
-            log_function_exit(logger, "get_or_create_chat_settings", duration=duration)
+            log_error_with_context(logger, e, "get_or_create_chat_settings")
             raise
     
-    def update_chat_settings(self, user_id: str, **kwargs) -> ChatSettings:
+    def _get_or_create_settings_row(self, user_uuid: uuid.UUID) -> ChatSettings:
+        settings = self.db.query(ChatSettings).filter(
+            ChatSettings.user_id == user_uuid
+        ).first()
+        
+        if not settings:
+            settings = ChatSettings(user_id=user_uuid)
+            self.db.add(settings)
+            self.db.commit()
+            self.db.refresh(settings)
+        
+        return settings
+    
+    @traced(logger, "update_chat_settings")
+    def update_chat_settings(self, user_id: UUIDLike, **kwargs) -> ChatSettingsSnapshot:
         """Update chat settings"""
-        start_time = time.time()
         try:
-            settings = self.get_or_create_chat_settings(user_id)
+            user_uuid = _to_uuid(user_id)
+            settings = self._get_or_create_settings_row(user_uuid)
             
             for key, value in kwargs.items():
                 if hasattr(settings, key):
                     setattr(settings, key, value)
             
-            settings.updated_at = datetime.utcnow()
             self.db.commit()
             self.db.refresh(settings)
+            with _settings_cache_lock:
+                _settings_cache.pop(user_uuid, None)
             
-            duration = time.time() - start_time
-            log_performance(logger, "update_chat_settings", duration)
-            log_function_exit(logger, "update_chat_settings", duration=duration)
-            return settings
+            return ChatSettingsSnapshot.from_model(settings)
         except Exception as e:
             self.db.rollback()
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "update_chat_settings", duration=duration)
-            logger.error(f"❌ Error updating chat settings: {e}")
-            log_function_exit(logger, "update_chat_settings", duration=duration)
+            log_error_with_context(logger, e, "update_chat_settings")
             raise
     
-    def get_chat_analytics(self, user_id: str, date_range_start: Optional[datetime] = None, 
+    @traced(logger, "get_chat_analytics")
+    def get_chat_analytics(self, user_id: UUIDLike, date_range_start: Optional[datetime] = None, 
                           date_range_end: Optional[datetime] = None) -> Dict[str, Any]:
         """Get chat analytics for user"""
-        start_time = time.time()
         try:
-            query = self.db.query(Chat).filter(Chat.user_id == uuid.UUID(user_id))
-            message_query = self.db.query(ChatMessage).join(Chat).filter(Chat.user_id == uuid.UUID(user_id))
+            user_uuid = _to_uuid(user_id)
+            chat_conditions = []
+            message_conditions = [ChatMessage.chat_id == Chat.id]
             
             if date_range_start:
-                query = query.filter(Chat.created_at >= date_range_start)
-                message_query = message_query.filter(ChatMessage.created_at >= date_range_start)
+                chat_conditions.append(Chat.created_at >= date_range_start)
+                message_conditions.append(ChatMessage.created_at >= date_range_start)
             
             if date_range_end:
-                query = query.filter(Chat.created_at <= date_range_end)
-                message_query = message_query.filter(ChatMessage.created_at <= date_range_end)
-            
-            total_chats = query.count()
-            total_messages = message_query.count()
-            ai_responses = message_query.filter(ChatMessage.is_ai_response == True).count()
-            
-            # Average response time
-            avg_response_time = self.db.query(func.avg(ChatMessage.processing_time_ms)).filter(
-                and_(
-                    ChatMessage.is_ai_response == True,
-                    ChatMessage.processing_time_ms.isnot(None)
-                )
-            ).scalar() or 0
+                chat_conditions.append(Chat.created_at <= date_range_end)
+                message_conditions.append(ChatMessage.created_at <= date_range_end)
+            
+            # All scalar totals in one pass over the user's chats and their messages
+            chat_count = func.count(distinct(Chat.id))
+            if chat_conditions:
+                chat_count = chat_count.filter(and_(*chat_conditions))
+            ai_response = ChatMessage.is_ai_response == True
+            
+            totals = self.db.query(
+                chat_count.label("total_chats"),
+                func.count(ChatMessage.id).label("total_messages"),
+                func.count(ChatMessage.id).filter(ai_response).label("ai_responses"),
+                func.avg(ChatMessage.processing_time_ms).filter(
+                    and_(ai_response, ChatMessage.processing_time_ms.isnot(None))
+                ).label("average_response_time_ms")
+            ).select_from(Chat).outerjoin(
+                ChatMessage, and_(*message_conditions)
+            ).filter(Chat.user_id == user_uuid).one()
+            
+            total_chats = totals.total_chats
+            total_messages = totals.total_messages
+            ai_responses = totals.ai_responses
+            avg_response_time = totals.average_response_time_ms or 0
             
             # Most used language
             most_used_language = self.db.query(Chat.language, func.count(Chat.id)).filter(
-                Chat.user_id == uuid.UUID(user_id)
+                Chat.user_id == user_uuid
             ).group_by(Chat.language).order_by(desc(func.count(Chat.id))).first()
             
             # Most used model
             most_used_model = self.db.query(Chat.model_preference, func.count(Chat.id)).filter(
-                Chat.user_id == uuid.UUID(user_id)
+                Chat.user_id == user_uuid
             ).group_by(Chat.model_preference).order_by(desc(func.count(Chat.id))).first()
             
             analytics = {
@@ -411,52 +509,68 @@ class ChatRepository:
                 "most_used_model": most_used_model[0] if most_used_model else "gemini-1.5-flash"
             }
             
-            duration = time.time() - start_time
-            log_performance(logger, "get_chat_analytics", duration)
-            log_function_exit(logger, "get_chat_analytics", duration=duration)
             return analytics
         except Exception as e:
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "get_chat_analytics", duration=duration)
-            logger.error(f"❌ Error getting chat analytics: {e}")
-            log_function_exit(logger, "get_chat_analytics", duration=duration)
+            log_error_with_context(logger, e, "get_chat_analytics")
             raise
     
-    def bulk_action_chats(self, user_id: str, chat_ids: List[str], action: str, **kwargs) -> Dict[str, int]:
+    @traced(logger, "bulk_action_chats")
+    def bulk_action_chats(self, user_id: UUIDLike, chat_ids: List[UUIDLike], action: str, **kwargs) -> Dict[str, int]:
         """Perform bulk action on chats"""
-        start_time = time.time()
         try:
-            success_count = 0
-            failed_count = 0
-            
+            chat_uuids = []
             for chat_id in chat_ids:
                 try:
-                    if action == "archive":
-                        self.update_chat(chat_id, user_id, is_archived=True)
-                    elif action == "unarchive":
-                        self.update_chat(chat_id, user_id, is_archived=False)
-                    elif action == "pin":
-                        self.update_chat(chat_id, user_id, is_pinned=True)
-                    elif action == "unpin":
-                        self.update_chat(chat_id, user_id, is_pinned=False)
-                    elif action == "delete":
-                        self.delete_chat(chat_id, user_id)
-                    
-                    success_count += 1
-                except Exception as e:
-                    logger.error(f"❌ Error performing {action} on chat {chat_id}: {e}")
-                    failed_count += 1
+                    chat_uuids.append(_to_uuid(chat_id))
+                except (ValueError, TypeError, AttributeError):
+                    logger.error(f"❌ Invalid chat ID for {action}: {chat_id}")
+            
+            # One statement for the whole set instead of a SELECT + UPDATE + commit per chat
+            owned_chats = self.db.query(Chat).filter(
+                and_(
+                    Chat.user_id == _to_uuid(user_id),
+                    Chat.id.in_(chat_uuids)
+                )
+            )
+            
+            updates = {
+                "archive": {"is_archived": True},
+                "unarchive": {"is_archived": False},
+                "pin": {"is_pinned": True},
+                "unpin": {"is_pinned": False},
+            }
+            
+            if not chat_uuids:
+                affected = 0
+            elif action in updates:
+                affected = owned_chats.update(
+                    updates[action],
+                    synchronize_session=False
+                )
+            elif action == "delete":
+                # Bulk deletes skip ORM cascades, so remove dependent rows first
+                owned_ids = owned_chats.with_entities(Chat.id).scalar_subquery()
+                message_ids = self.db.query(ChatMessage.id).filter(
+                    ChatMessage.chat_id.in_(owned_ids)
+                ).scalar_subquery()
+                self.db.query(ChatFeedback).filter(
+                    ChatFeedback.message_id.in_(message_ids)
+                ).delete(synchronize_session=False)
+                self.db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(owned_ids)
+                ).delete(synchronize_session=False)
+                affected = owned_chats.delete(synchronize_session=False)
+            else:
+                logger.error(f"❌ Unknown bulk action: {action}")
+                affected = 0
             
             self.db.commit()
             
-            duration = time.time() - start_time
-            log_performance(logger, "bulk_action_chats", duration)
-            log_function_exit(logger, "bulk_action_chats", duration=duration)
+            success_count = affected
+            failed_count = len(chat_ids) - affected
+            
             return {"success_count": success_count, "failed_count": failed_count}
         except Exception as e:
             self.db.rollback()
-            duration = time.time() - start_time
-            log_error_with_context(logger, e, "bulk_action_chats", duration=duration)
-            logger.error(f"❌ Error performing bulk action on chats: {e}")
-            log_function_exit(logger, "bulk_action_chats", duration=duration)
+            log_error_with_context(logger, e, "bulk_action_chats")
             raise
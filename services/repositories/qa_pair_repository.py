@@ -1,13 +1,33 @@
 import uuid
 from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, raiseload, load_only
+from sqlalchemy import and_, or_, func, bindparam, select, insert, update, delete
 from models.domain.qa_pair import QAPair
 import logging
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Prebuilt so the by-id lookup always hits the compiled statement cache
+_QA_PAIR_BY_ID = select(QAPair).where(QAPair.id == bindparam("qa_id"))
+
+# Columns update_qa_pair may set (question_text_norm is generated by the database)
+_QA_PAIR_COLUMNS = frozenset(
+    attr.key for attr in QAPair.__mapper__.column_attrs if attr.key != "question_text_norm"
+)
+
+
+def _list_options(fields: Optional[List[str]]) -> tuple:
+    """Loader options for list queries; fields trims the row to those columns plus id/created_at"""
+    # List queries raise on any lazy relationship load rather than N+1 per row
+    options = (raiseload("*"),)
+    if fields:
+        columns = {"id", "created_at", *fields}
+        # Columns left out raise on access instead of lazy-loading one row at a time
+        options = (load_only(*(getattr(QAPair, name) for name in columns), raiseload=True), *options)
+    return options
+
+
 class QAPairRepository:
     """
     Repository for Q&A pair operations.
@@ -49,12 +69,12 @@ class QAPairRepository:
                 confidence=confidence,
                 source=source,
                 language=language,
-                qa_metadata=metadata or {}
+                qa_metadata=metadata or {},
+                external_qa_id=(metadata or {}).get("qa_id")
             )
             
             db.add(qa_pair)
             db.commit()
-            db.refresh(qa_pair)
             
             logger.debug(f"Created Q&A pair with ID: {qa_pair.id}")
             return qa_pair
@@ -64,6 +84,47 @@ class QAPairRepository:
             logger.error(f"Failed to create Q&A pair: {e}")
             raise
     
+    def bulk_create_qa_pairs(self, db: Session, rows: List[Dict[str, Any]]) -> List[uuid.UUID]:
+        """
+        Create many Q&A pairs in one INSERT ... RETURNING and a single commit.
+        
+        Args:
+            db: Database session
+            rows: Dicts with the create_qa_pair arguments (question_text and
+                answer_text required; the rest fall back to the same defaults)
+            
+        Returns:
+            IDs of the created Q&A pairs, in input order
+        """
+        if not rows:
+            return []
+        try:
+            values = []
+            for row in rows:
+                metadata = row.get("metadata") or {}
+                values.append({
+                    "question_text": row["question_text"],
+                    "answer_text": row["answer_text"],
+                    "user_id": row.get("user_id"),
+                    "confidence": row.get("confidence", 0.8),
+                    "source": row.get("source", "gemini_api"),
+                    "language": row.get("language", "auto"),
+                    "qa_metadata": metadata,
+                    "external_qa_id": metadata.get("qa_id")
+                })
+            
+            result = db.execute(insert(QAPair).returning(QAPair.id, sort_by_parameter_order=True), values)
+            qa_ids = list(result.scalars())
+            db.commit()
+            
+            logger.debug(f"Created {len(qa_ids)} Q&A pairs in bulk")
+            return qa_ids
+            
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to bulk create Q&A pairs: {e}")
+            raise
+    
     def get_qa_pair_by_id(self, db: Session, qa_id: uuid.UUID) -> Optional[QAPair]:
         """
         Get Q&A pair by ID.
@@ -76,7 +137,7 @@ class QAPairRepository:
             QAPair instance or None
         """
         try:
-            return db.query(QAPair).filter(QAPair.id == qa_id).first()
+            return db.execute(_QA_PAIR_BY_ID, {"qa_id": qa_id}).scalar_one_or_none()
         except Exception as e:
             logger.error(f"Failed to get Q&A pair by ID {qa_id}: {e}")
             return None
@@ -93,9 +154,9 @@ class QAPairRepository:
             QAPair instance or None
         """
         try:
-            # Search in metadata for qa_id
+            # qa_id is mirrored from metadata into an indexed column on create
             return db.query(QAPair).filter(
-                QAPair.qa_metadata.contains({"qa_id": question_id})
+                QAPair.external_qa_id == question_id
             ).first()
         except Exception as e:
             logger.error(f"Failed to get Q&A pair by question ID {question_id}: {e}")
@@ -127,13 +188,20 @@ class QAPairRepository:
             if user_id:
                 query = query.filter(QAPair.user_id == user_id)
             
-            # Simple text similarity (can be enhanced with full-text search)
-            # For now, we'll use a simple LIKE query
+            # Trigram similarity (pg_trgm % operator), plus a substring match on the first
+            # 20 characters; both run on the lower-cased column and its qa_norm_trgm GIN index
+            normalized = question_text.lower()
+            q = bindparam("q", normalized)
+            # LIKE wildcards in the user's text are matched literally
+            prefix = normalized[:20].replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = bindparam("pattern", f"%{prefix}%")
             similar_qa_pairs = query.filter(
                 or_(
-                    QAPair.question_text.ilike(f"%{question_text}%"),
-                    QAPair.question_text.ilike(f"%{question_text[:20]}%")
+                    QAPair.question_text_norm.op("%")(q),
+                    QAPair.question_text_norm.like(pattern, escape="\\")
                 )
+            ).order_by(
+                func.similarity(QAPair.question_text_norm, q).desc()
             ).limit(limit).all()
             
             logger.debug(f"Found {len(similar_qa_pairs)} similar questions")
@@ -147,7 +215,8 @@ class QAPairRepository:
         self,
         db: Session,
         limit: int = 10,
-        user_id: Optional[uuid.UUID] = None
+        user_id: Optional[uuid.UUID] = None,
+        fields: Optional[List[str]] = None
     ) -> List[QAPair]:
         """
         Get recent Q&A pairs.
@@ -156,12 +225,13 @@ class QAPairRepository:
             db: Database session
             limit: Maximum number of results
             user_id: Optional user ID filter
+            fields: Optional columns to load (e.g. ["question_text", "created_at"]); the rest are not fetched
             
         Returns:
             List of recent QAPair instances
         """
         try:
-            query = db.query(QAPair).order_by(QAPair.created_at.desc())
+            query = db.query(QAPair).options(*_list_options(fields)).order_by(QAPair.created_at.desc())
             
             if user_id:
                 query = query.filter(QAPair.user_id == user_id)
@@ -190,17 +260,19 @@ class QAPairRepository:
             Updated QAPair instance or None
         """
         try:
-            qa_pair = self.get_qa_pair_by_id(db, qa_id)
+            values = {key: value for key, value in kwargs.items() if key in _QA_PAIR_COLUMNS}
+            if not values:
+                return self.get_qa_pair_by_id(db, qa_id)
+            
+            # Single UPDATE ... RETURNING; no row back means the pair does not exist
+            qa_pair = db.scalars(
+                update(QAPair).where(QAPair.id == qa_id).values(**values).returning(QAPair)
+            ).one_or_none()
             if not qa_pair:
+                db.rollback()
                 return None
             
-            # Update fields
-            for key, value in kwargs.items():
-                if hasattr(qa_pair, key):
-                    setattr(qa_pair, key, value)
-            
             db.commit()
-            db.refresh(qa_pair)
             
             logger.debug(f"Updated Q&A pair with ID: {qa_id}")
             return qa_pair
@@ -222,12 +294,11 @@ class QAPairRepository:
             Success status
         """
         try:
-            qa_pair = self.get_qa_pair_by_id(db, qa_id)
-            if not qa_pair:
-                return False
-            
-            db.delete(qa_pair)
+            # QAPair has no relationships to cascade, so a plain DELETE is equivalent
+            result = db.execute(delete(QAPair).where(QAPair.id == qa_id))
             db.commit()
+            if not result.rowcount:
+                return False
             
             logger.debug(f"Deleted Q&A pair with ID: {qa_id}")
             return True
@@ -241,7 +312,8 @@ class QAPairRepository:
         self,
         db: Session,
         source: str,
-        limit: int = 50
+        limit: int = 50,
+        fields: Optional[List[str]] = None
     ) -> List[QAPair]:
         """
         Get Q&A pairs by source.
@@ -250,12 +322,13 @@ class QAPairRepository:
             db: Database session
             source: Source filter (gemini_api, vector_search, etc.)
             limit: Maximum number of results
+            fields: Optional columns to load (e.g. ["question_text", "created_at"]); the rest are not fetched
             
         Returns:
             List of QAPair instances
         """
         try:
-            return db.query(QAPair).filter(
+            return db.query(QAPair).options(*_list_options(fields)).filter(
                 QAPair.source == source
             ).order_by(QAPair.created_at.desc()).limit(limit).all()
             
@@ -267,7 +340,8 @@ class QAPairRepository:
         self,
         db: Session,
         language: str,
-        limit: int = 50
+        limit: int = 50,
+        fields: Optional[List[str]] = None
     ) -> List[QAPair]:
         """
         Get Q&A pairs by language.
@@ -276,12 +350,13 @@ class QAPairRepository:
             db: Database session
             language: Language filter
             limit: Maximum number of results
+            fields: Optional columns to load (e.g. ["question_text", "created_at"]); the rest are not fetched
             
         Returns:
             List of QAPair instances
         """
         try:
-            return db.query(QAPair).filter(
+            return db.query(QAPair).options(*_list_options(fields)).filter(
                 QAPair.language == language
             ).order_by(QAPair.created_at.desc()).limit(limit).all()
             
@@ -294,7 +369,8 @@ class QAPairRepository:
         db: Session,
         min_confidence: float = 0.0,
         max_confidence: float = 1.0,
-        limit: int = 50
+        limit: int = 50,
+        fields: Optional[List[str]] = None
     ) -> List[QAPair]:
         """
         Get Q&A pairs by confidence range.
@@ -304,12 +380,13 @@ class QAPairRepository:
             min_confidence: Minimum confidence score
             max_confidence: Maximum confidence score
             limit: Maximum number of results
+            fields: Optional columns to load (e.g. ["question_text", "created_at"]); the rest are not fetched
             
         Returns:
             List of QAPair instances
         """
         try:
-            return db.query(QAPair).filter(
+            return db.query(QAPair).options(*_list_options(fields)).filter(
                 and_(
                     QAPair.confidence >= min_confidence,
                     QAPair.confidence <= max_confidence
@@ -331,31 +408,26 @@ class QAPairRepository:
             Dictionary with statistics
         """
         try:
-            total_count = db.query(QAPair).count()
+            # Total and average confidence in one aggregate, computed by the database
+            total_count, avg_confidence = db.query(
+                func.count(QAPair.id), func.avg(QAPair.confidence)
+            ).one()
             
             # Count by source
-            source_counts = {}
-            sources = db.query(QAPair.source).distinct().all()
-            for source in sources:
-                count = db.query(QAPair).filter(QAPair.source == source[0]).count()
-                source_counts[source[0]] = count
+            source_counts = dict(
+                db.query(QAPair.source, func.count(QAPair.id)).group_by(QAPair.source).all()
+            )
             
             # Count by language
-            language_counts = {}
-            languages = db.query(QAPair.language).distinct().all()
-            for language in languages:
-                count = db.query(QAPair).filter(QAPair.language == language[0]).count()
-                language_counts[language[0]] = count
-            
-            # Average confidence
-            avg_confidence = db.query(QAPair.confidence).all()
-            avg_confidence = sum([c[0] for c in avg_confidence]) / len(avg_confidence) if avg_confidence else 0
+            language_counts = dict(
+                db.query(QAPair.language, func.count(QAPair.id)).group_by(QAPair.language).all()
+            )
             
             return {
                 "total_count": total_count,
                 "source_counts": source_counts,
                 "language_counts": language_counts,
-                "average_confidence": round(avg_confidence, 3)
+                "average_confidence": round(float(avg_confidence or 0), 3)
             }
             
         except Exception as e:
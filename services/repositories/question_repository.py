@@ -1,8 +1,11 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Iterator, List, Optional
+from sqlalchemy.orm import Session, raiseload
 from models.domain.question import Question
 import uuid
 
+# Rows fetched per round trip when streaming the full questions table
+QUESTIONS_YIELD_PER = 1000
+
 class QuestionRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -24,11 +27,11 @@ class QuestionRepository:
 
     def get_questions_by_user_id(self, user_id: uuid.UUID) -> List[Question]:
         """الحصول على جميع أسئلة المستخدم"""
-        return self.db.query(Question).filter(Question.user_id == user_id).all()
+        return self.db.query(Question).options(raiseload("*")).filter(Question.user_id == user_id).all()
 
-    def get_all_questions(self) -> List[Question]:
-        """الحصول على جميع الأسئلة"""
-        return self.db.query(Question).all()
+    def get_all_questions(self) -> Iterator[Question]:
+        """الحصول على جميع الأسئلة (تُقرأ على دفعات عبر مؤشر من جهة الخادم)"""
+        return iter(self.db.query(Question).yield_per(QUESTIONS_YIELD_PER))
 
     def update_question(self, question_id: uuid.UUID, question: str) -> Optional[Question]:
         """تحديث سؤال"""
@@ -1,42 +1,64 @@
 from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_
+from sqlalchemy import or_, and_, select, bindparam, update, union_all, case, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 from models.domain.user import User
-from services.database import SessionLocal
-import json
 import logging
 import time
+from datetime import datetime, timezone, timedelta
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Hot lookups as prebuilt statements: constant SQL shape, so every call is a compiled-cache hit
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_USER_BY_PHONE = select(User).where(User.phone_number == bindparam("phone_number"))
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+# Not unique columns, so LIMIT 1 keeps scalar_one_or_none() to a single row
+_USER_BY_OAUTH = select(User).where(
+    User.oauth_provider == bindparam("provider"),
+    User.oauth_provider_id == bindparam("provider_id")
+).limit(1)
+_USER_BY_TOKEN = select(User).where(
+    User.token == bindparam("token"),
+    User.token_expiry > bindparam("now")
+).limit(1)
+
+# Unique constraints on users (PostgreSQL default names) and the message each maps to
+_CONSTRAINT_TO_MSG = {
+    "users_email_key": "Email already exists",
+    "users_phone_number_key": "Phone number already exists",
+}
+_UNIQUE_VIOLATION = "23505"
+
+
+def _integrity_error_message(error: IntegrityError, duplicate_message: str) -> str:
+    """Map an IntegrityError to a user-facing message from the driver's diagnostics"""
+    orig = error.orig
+    constraint_name = getattr(getattr(orig, "diag", None), "constraint_name", None)
+    if constraint_name in _CONSTRAINT_TO_MSG:
+        return _CONSTRAINT_TO_MSG[constraint_name]
+    if getattr(orig, "pgcode", None) == _UNIQUE_VIOLATION:
+        return duplicate_message
+    return "Database constraint violation"
+
+
+# Writable columns for update_user (full_name is generated by the database)
+_USER_UPDATABLE_COLUMNS = frozenset(
+    attr.key for attr in User.__mapper__.column_attrs if attr.key != "full_name"
+)
+
 class UserRepository:
-    def __init__(self):
-        logger.debug("Initializing UserRepository")
-        self._session = None
-    
-    def _get_session(self) -> Session:
-        """Get or create a database session"""
-        if self._session is None:
-            logger.debug("Creating new database session for UserRepository")
-            self._session = SessionLocal()
-        return self._session
-    
-    def _close_session(self):
-        """Close the current session"""
-        if self._session:
-            logger.debug("Closing UserRepository database session")
-            self._session.close()
-            self._session = None
+    """User queries; every method runs on the session passed in by the caller"""
 
     def find_user_by_oauth(self, db: Session, provider: str, provider_id: str) -> Optional[User]:
         logger.debug(f"Finding OAuth user with provider: {provider}, provider_id: {provider_id}")
         try:
-            user = db.query(User).filter(
-                User.oauth_provider == provider,
-                User.oauth_provider_id == provider_id
-            ).first()
+            user = db.execute(
+                _USER_BY_OAUTH, {"provider": provider, "provider_id": provider_id}
+            ).scalar_one_or_none()
             logger.debug(f"OAuth user lookup result: {'Found' if user else 'Not found'}")
             return user
         except Exception as e:
@@ -48,19 +70,10 @@ class UserRepository:
             user = User(**user_data)
             db.add(user)
             db.commit()
-            db.refresh(user)
             return user, None
         except IntegrityError as e:
             db.rollback()
-            error_msg = str(e).lower()
-            if "email" in error_msg and "unique" in error_msg:
-                return None, "Email already exists"
-            elif "phone_number" in error_msg and "unique" in error_msg:
-                return None, "Phone number already exists"
-            elif "unique" in error_msg:
-                return None, "User data conflict - duplicate entry"
-            else:
-                return None, "Database constraint violation"
+            return None, _integrity_error_message(e, "User data conflict - duplicate entry")
         except Exception as e:
             db.rollback()
             logger.error(f"Database error in create_user: {e}")
@@ -68,60 +81,64 @@ class UserRepository:
 
     def get_user_by_email(self, db: Session, email: str) -> Optional[User]:
         try:
-            return db.query(User).filter(User.email == email).first()
+            return db.execute(_USER_BY_EMAIL, {"email": email}).scalar_one_or_none()
         except Exception as e:
             logger.error(f"Error getting user by email: {e}")
             return None
 
     def get_user_by_phone(self, db: Session, phone_number: str) -> Optional[User]:
         try:
-            return db.query(User).filter(User.phone_number == phone_number).first()
+            return db.execute(_USER_BY_PHONE, {"phone_number": phone_number}).scalar_one_or_none()
         except Exception as e:
             logger.error(f"Error getting user by phone: {e}")
             return None
 
     def get_user_by_id(self, db: Session, user_id: str) -> Optional[User]:
         try:
-            return db.query(User).filter(User.id == user_id).first()
+            return db.execute(_USER_BY_ID, {"user_id": user_id}).scalar_one_or_none()
         except Exception as e:
             logger.error(f"Error getting user by ID: {e}")
             return None
 
-    def get_user_by_token(self, db: Session, token: str) -> Optional[User]:
+    def get_user_for_password_check(self, db: Session, user_id: str) -> Optional[Row]:
+        """Fetch only (id, password_hash) for password verification"""
         try:
-            from datetime import datetime, timezone
-            return db.query(User).filter(
-                User.token == token,
-                User.token_expiry > datetime.now(timezone.utc)
+            return db.execute(
+                select(User.id, User.password_hash).where(User.id == user_id)
             ).first()
+        except Exception as e:
+            logger.error(f"Error getting password hash for user: {e}")
+            return None
+
+    def get_user_by_token(self, db: Session, token: str) -> Optional[User]:
+        try:
+            return db.execute(
+                _USER_BY_TOKEN, {"token": token, "now": datetime.now(timezone.utc)}
+            ).scalar_one_or_none()
         except Exception as e:
             logger.error(f"Error getting user by token: {e}")
             return None
 
     def update_user(self, db: Session, user_id: str, update_data: dict) -> tuple[Optional[User], Optional[str]]:
         try:
-            user = db.query(User).filter(User.id == user_id).first()
+            values = {key: value for key, value in update_data.items() if key in _USER_UPDATABLE_COLUMNS}
+            if not values:
+                user = self.get_user_by_id(db, user_id)
+                return (user, None) if user else (None, "User not found")
+            
+            # One UPDATE ... RETURNING instead of SELECT, then UPDATE; no row means no such user
+            user = db.scalars(
+                update(User).where(User.id == user_id).values(**values).returning(User)
+            ).one_or_none()
             if not user:
+                db.rollback()
                 return None, "User not found"
             
-            for key, value in update_data.items():
-                if hasattr(user, key):
-                    setattr(user, key, value)
-            
             db.commit()
-            db.refresh(user)
             return user, None
         except IntegrityError as e:
             db.rollback()
-            error_msg = str(e).lower()
-            if "email" in error_msg and "unique" in error_msg:
-                return None, "Email already exists"
-            elif "phone_number" in error_msg and "unique" in error_msg:
-                return None, "Phone number already exists"
-            elif "unique" in error_msg:
-                return None, "Data conflict - duplicate entry"
-            else:
-                return None, "Database constraint violation"
+            return None, _integrity_error_message(e, "Data conflict - duplicate entry")
         except Exception as e:
             db.rollback()
             logger.error(f"Database error in update_user: {e}")
@@ -141,86 +158,66 @@ class UserRepository:
             logger.error(f"Database error in delete_user: {e}")
             return False, "Database error occurred"
 
+    @staticmethod
+    def _split_oauth_name(name: Optional[str]) -> Dict[str, Optional[str]]:
+        """Split a provider display name into first/last name (full_name is DB-generated)"""
+        if not name or not name.strip():
+            return {"first_name": None, "last_name": None}
+        first_name, _, last_name = name.strip().partition(" ")
+        return {"first_name": first_name, "last_name": last_name.strip() or None}
+
+    @staticmethod
+    def _build_oauth_fields(oauth_data: Dict[str, Any]) -> Dict[str, Any]:
+        """User columns set when an account is created or linked through OAuth"""
+        oauth_tokens = oauth_data.get("oauth_tokens", {})
+        expires_in = oauth_tokens.get("expires_in")
+        return {
+            "oauth_provider": oauth_data.get("provider"),
+            "oauth_provider_id": oauth_data.get("provider_id"),
+            "oauth_data": oauth_data or None,
+            "oauth_access_token": oauth_tokens.get("access_token"),
+            "oauth_refresh_token": oauth_tokens.get("refresh_token"),
+            "oauth_token_expires_at": (
+                datetime.now(timezone.utc) + timedelta(seconds=expires_in) if expires_in else None
+            ),
+            "is_email_verified": True,
+            "status": "active",
+            "profile_picture": oauth_data.get("picture")
+        }
+
     def create_oauth_user(self, db: Session, oauth_data: Dict[str, Any]) -> tuple[Optional[User], Optional[str]]:
         try:
-            existing_user = None
-            if oauth_data.get("email"):
-                existing_user = db.query(User).filter(User.email == oauth_data["email"]).first()
+            fields = self._build_oauth_fields(oauth_data)
+            names = self._split_oauth_name(oauth_data.get("name"))
+            stmt = pg_insert(User).values(email=oauth_data.get("email"), **fields, **names)
 
-            if existing_user:
-                if not existing_user.oauth_provider:
-                    # Extract OAuth tokens
-                    oauth_tokens = oauth_data.get("oauth_tokens", {})
-                    from datetime import datetime, timezone, timedelta
-                    
-                    # Calculate token expiry
-                    expires_in = oauth_tokens.get("expires_in")
-                    token_expires_at = None
-                    if expires_in:
-                        token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-                    
-                    update_data = {
-                        "oauth_provider": oauth_data.get("provider"),
-                        "oauth_provider_id": oauth_data.get("provider_id"),
-                        "oauth_data": json.dumps(oauth_data) if oauth_data else None,
-                        "oauth_access_token": oauth_tokens.get("access_token"),
-                        "oauth_refresh_token": oauth_tokens.get("refresh_token"),
-                        "oauth_token_expires_at": token_expires_at,
-                        "is_email_verified": True,
-                        "status": "active",
-                        "profile_picture": oauth_data.get("picture"),
-                        "full_name": oauth_data.get("name")
-                    }
-                    
-                    for key, value in update_data.items():
-                        if hasattr(existing_user, key) and value is not None:
-                            setattr(existing_user, key, value)
-                    
-                    db.commit()
-                    db.refresh(existing_user)
-                    return existing_user, None
-                else:
-                    return existing_user, None
+            # An existing account is linked only if it has no provider yet; already-linked
+            # rows keep their values. Either way the row comes back from RETURNING.
+            linkable = User.oauth_provider.is_(None)
+            # full_name is generated from first/last name, so only fill names the user lacks
+            nameless = and_(
+                linkable,
+                func.coalesce(User.first_name, "") == "",
+                func.coalesce(User.last_name, "") == ""
+            )
 
-            # Extract OAuth tokens
-            oauth_tokens = oauth_data.get("oauth_tokens", {})
-            from datetime import datetime, timezone, timedelta
-            
-            # Calculate token expiry
-            expires_in = oauth_tokens.get("expires_in")
-            token_expires_at = None
-            if expires_in:
-                token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-            
-            user_data = {
-                "email": oauth_data.get("email"),
-                "oauth_provider": oauth_data.get("provider"),
-                "oauth_provider_id": oauth_data.get("provider_id"),
-                "oauth_data": json.dumps(oauth_data) if oauth_data else None,
-                "oauth_access_token": oauth_tokens.get("access_token"),
-                "oauth_refresh_token": oauth_tokens.get("refresh_token"),
-                "oauth_token_expires_at": token_expires_at,
-                "is_email_verified": True,
-                "status": "active",
-                "profile_picture": oauth_data.get("picture"),
-                "full_name": oauth_data.get("name")
-            }
+            def fill(key: str, condition) -> Any:
+                column = getattr(User, key)
+                # None from the provider never overwrites a stored value
+                return case((condition, func.coalesce(stmt.excluded[key], column)), else_=column)
 
-            user = User(**user_data)
-            db.add(user)
+            set_ = {key: fill(key, linkable) for key in fields}
+            set_.update({key: fill(key, nameless) for key in names})
+            set_["updated_at"] = case((linkable, func.now()), else_=User.updated_at)
+
+            stmt = stmt.on_conflict_do_update(index_elements=[User.email], set_=set_).returning(User)
+            user = db.scalars(stmt, execution_options={"populate_existing": True}).one()
             db.commit()
-            db.refresh(user)
             return user, None
 
         except IntegrityError as e:
             db.rollback()
-            error_msg = str(e).lower()
-            if "email" in error_msg and "unique" in error_msg:
-                return None, "Email already exists"
-            elif "unique" in error_msg:
-                return None, "User data conflict - duplicate entry"
-            else:
-                return None, "Database constraint violation"
+            return None, _integrity_error_message(e, "User data conflict - duplicate entry")
         except Exception as e:
             db.rollback()
             logger.error(f"Database error in create_oauth_user: {e}")
@@ -228,20 +225,21 @@ class UserRepository:
 
     def find_user_by_email_or_oauth(self, db: Session, email: str = None, provider: str = None, provider_id: str = None) -> Optional[User]:
         try:
-            query = db.query(User)
-            
-            conditions = []
+            # Each branch is its own index seek (email unique index, ix_users_oauth_provider_id);
+            # UNION ALL keeps it to one round trip instead of an OR the planner may scan for
+            branches = []
             if email:
-                conditions.append(User.email == email)
+                branches.append(select(User).where(User.email == email).limit(1))
             if provider and provider_id:
-                conditions.append(
-                    (User.oauth_provider == provider) & 
-                    (User.oauth_provider_id == provider_id)
-                )
+                branches.append(select(User).where(and_(
+                    User.oauth_provider == provider,
+                    User.oauth_provider_id == provider_id
+                )).limit(1))
             
-            if conditions:
-                return query.filter(or_(*conditions)).first()
-            return None
+            if not branches:
+                return None
+            stmt = branches[0] if len(branches) == 1 else select(User).from_statement(union_all(*branches))
+            return db.execute(stmt).scalars().first()
         except Exception as e:
             logger.error(f"Error finding user by email or OAuth: {e}")
             return None
@@ -249,12 +247,6 @@ class UserRepository:
     def update_oauth_tokens(self, db: Session, user_id: str, access_token: str, refresh_token: str = None, expires_in: int = None) -> tuple[bool, Optional[str]]:
         """Update OAuth tokens for a user"""
         try:
-            from datetime import datetime, timezone, timedelta
-            
-            user = db.query(User).filter(User.id == user_id).first()
-            if not user:
-                return False, "User not found"
-            
             update_data = {
                 "oauth_access_token": access_token,
                 "last_login_at": datetime.now(timezone.utc)
@@ -266,12 +258,13 @@ class UserRepository:
             if expires_in:
                 update_data["oauth_token_expires_at"] = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
             
-            for key, value in update_data.items():
-                if hasattr(user, key):
-                    setattr(user, key, value)
+            # Known columns only, so a plain UPDATE replaces the SELECT + per-attribute setattr
+            result = db.execute(update(User).where(User.id == user_id).values(**update_data))
+            if not result.rowcount:
+                db.rollback()
+                return False, "User not found"
             
             db.commit()
-            db.refresh(user)
             return True, None
             
         except Exception as e:
@@ -282,21 +275,20 @@ class UserRepository:
     def is_oauth_token_expired(self, db: Session, user_id: str) -> bool:
         """Check if OAuth token is expired for a user"""
         try:
-            from datetime import datetime, timezone
-            
-            user = db.query(User).filter(User.id == user_id).first()
-            if not user or not user.oauth_token_expires_at:
-                return True
+            # The database evaluates the comparison; only one boolean comes back
+            expired = db.execute(
+                select(case(
+                    (User.oauth_token_expires_at.is_(None), True),
+                    else_=User.oauth_token_expires_at < func.now()
+                )).where(User.id == user_id)
+            ).scalar()
             
-            return user.oauth_token_expires_at < datetime.now(timezone.utc)
+            # No row: unknown user, treated as expired like a missing expiry
+            return True if expired is None else bool(expired)
             
         except Exception as e:
             logger.error(f"Error checking OAuth token expiry: {e}")
             return True
 
-    def __del__(self):
-        """Cleanup method to ensure session is closed"""
-        self._close_session()
-
 
-user_repository = UserRepository()
\ No newline at end of file
+user_repository = UserRepository()